@@ -0,0 +1,52 @@
+import gc
+import md20
+
+__version__ = "1.0.2"
+
+print(f"example version: {__version__}")
+print(f"md20 lib version: {md20.__version__}")
+
+
+# stand-in for machine.I2C, so this check runs without a board attached
+class StandInI2C:
+
+    def __init__(self):
+        self._mem = bytearray(0xA4)
+
+    def writeto_mem(self, address, mem_addr, buffer):
+        if mem_addr < 0x24:
+            for i in range(len(buffer)):
+                self._mem[mem_addr + i] = buffer[i]
+            self._mem[0x23] = 0
+
+    def readfrom_mem(self, address, mem_addr, size):
+        return bytes(self._mem[mem_addr : mem_addr + size])
+
+    def readfrom_mem_into(self, address, mem_addr, buffer):
+        for i in range(len(buffer)):
+            buffer[i] = self._mem[mem_addr + i]
+
+
+md20_obj = md20.Md20(StandInI2C())
+motor = md20_obj[0]
+
+getters = (
+    ("state", lambda: motor.state),
+    ("speed", lambda: motor.speed),
+    ("position", lambda: motor.position),
+    ("pulse_count", lambda: motor.pulse_count),
+    ("pwm_duty", lambda: motor.pwm_duty),
+)
+
+failed = False
+for name, getter in getters:
+    getter()
+    gc.collect()
+    before = gc.mem_alloc()
+    for _ in range(100):
+        getter()
+    allocated = gc.mem_alloc() - before
+    print(f"{name}: {allocated} bytes allocated in 100 reads")
+    failed = failed or allocated != 0
+
+print("FAILED" if failed else "PASSED")
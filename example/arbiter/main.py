@@ -0,0 +1,37 @@
+import _thread
+import machine
+import time
+import md20
+import md20_arbiter
+
+__version__ = "1.0.2"
+
+print(f"example version: {__version__}")
+print(f"md20 lib version: {md20.__version__}")
+
+# setup
+i2c = machine.I2C(0, sda=21, scl=22, freq=400000)
+arbiter = md20_arbiter.LockArbiter()
+md20_obj = md20.Md20(i2c, i2c_address=md20.DEFAULT_I2C_ADDRESS, arbiter=arbiter)
+
+# setup encoder motor
+for i in range(md20.MOTOR_NUM):
+    md20_obj[i].setup_encoder_mode(12, 90, md20.PHASE_RELATION_A_PHASE_LEADS)
+
+
+def telemetry():
+    while True:
+        snapshots = md20_obj.snapshot_all()
+        print(f"speeds: {snapshots[0].speed:4}, {snapshots[1].speed:4}, {snapshots[2].speed:4}, {snapshots[3].speed:4}")
+        time.sleep_ms(20)
+
+
+_thread.start_new_thread(telemetry, ())
+
+while True:
+    md20_obj.run_speed_all((100, 100, 100, 100))
+    time.sleep_ms(2000)
+    md20_obj.stop_all()
+    time.sleep_ms(1000)
+    for priority, label in ((md20.PRIORITY_URGENT, "urgent"), (md20.PRIORITY_COMMAND, "command"), (md20.PRIORITY_TELEMETRY, "telemetry")):
+        print(f"{label} waits: {arbiter.waits[priority]}, avg: {arbiter.average_wait_us(priority)} us, max: {arbiter.wait_max_us[priority]} us")
@@ -0,0 +1,47 @@
+import asyncio
+import machine
+import md20
+import md20_async
+
+__version__ = "1.0.2"
+
+print(f"example version: {__version__}")
+print(f"md20 lib version: {md20.__version__}")
+
+
+async def blink():
+    led = machine.Pin(2, machine.Pin.OUT)
+    while True:
+        led.value(not led.value())
+        await asyncio.sleep_ms(100)
+
+
+async def main():
+    i2c = machine.I2C(0, sda=21, scl=22, freq=400000)
+    md20_obj = md20_async.AsyncMd20(i2c, i2c_address=md20.DEFAULT_I2C_ADDRESS, poll_interval_ms=1, max_poll_interval_ms=16, timeout_ms=1000)
+    await md20_obj.reset()
+    print(f"device id: {md20_obj.device_id:#04x}")
+    print(f"name: {md20_obj.name}")
+    print(f"firmware version: {md20_obj.firmware_version}")
+
+    for i in range(md20.MOTOR_NUM):
+        await md20_obj[i].setup_encoder_mode(12, 90, md20.PHASE_RELATION_A_PHASE_LEADS)
+        await md20_obj[i].set_speed_pid(1.5, 1.5, 1.0)
+        await md20_obj[i].set_position_pid(10.0, 1.0, 1.0)
+
+    asyncio.create_task(blink())
+
+    target_speed = 100
+    while True:
+        for i in range(md20.MOTOR_NUM):
+            print(f"motor {i} run speed: {target_speed}")
+            await md20_obj[i].run_speed(target_speed)
+        target_speed = -target_speed
+
+        for _ in range(10):
+            snapshots = await md20_obj.snapshot_all()
+            print(f"speeds: {snapshots[0].speed:4}, {snapshots[1].speed:4}, {snapshots[2].speed:4}, {snapshots[3].speed:4}")
+            await asyncio.sleep_ms(200)
+
+
+asyncio.run(main())
@@ -0,0 +1,42 @@
+import machine
+import md20
+import md20_control
+from md20_telemetry import FIELD_PULSE_COUNT
+
+__version__ = "1.0.2"
+
+print(f"example version: {__version__}")
+print(f"md20 lib version: {md20.__version__}")
+
+# setup
+i2c = machine.I2C(0, sda=21, scl=22, freq=400000)
+md20_obj = md20.Md20(i2c, i2c_address=md20.DEFAULT_I2C_ADDRESS)
+
+for i in range(md20.MOTOR_NUM):
+    md20_obj[i].setup_dc_mode()
+
+# hold every motor at a pulse count target with a proportional loop closed on the host
+targets = [0] * md20.MOTOR_NUM
+duties = [0] * md20.MOTOR_NUM
+GAIN = 4
+
+
+def step(feedback, interval_us):
+    for i in range(md20.MOTOR_NUM):
+        targets[i] += 2
+        error = targets[i] - feedback[i][FIELD_PULSE_COUNT]
+        duties[i] = max(-1023, min(1023, error * GAIN))
+    return duties
+
+
+loop = md20_control.ControlLoop(md20_obj, step, period_us=5000, command=md20_control.COMMAND_PWM_DUTY)
+
+while True:
+    loop.reset_stats()
+    loop.run(200)
+    print(
+        f"iterations: {loop.iterations}, overruns: {loop.overruns},",
+        f"jitter avg/max us: {loop.avg_jitter_us}/{loop.max_jitter_us},",
+        f"step avg/max us: {loop.avg_step_us}/{loop.max_step_us},",
+        f"cycle avg/max us: {loop.avg_cycle_us}/{loop.max_cycle_us}, sustainable rate: {loop.sustainable_rate_hz} Hz",
+    )
@@ -0,0 +1,36 @@
+import machine
+import md20
+
+__version__ = "1.0.2"
+
+print(f"example version: {__version__}")
+print(f"md20 lib version: {md20.__version__}")
+
+# setup
+i2c = machine.I2C(0, sda=21, scl=22, freq=400000)
+md20_obj = md20.Md20(i2c, i2c_address=md20.DEFAULT_I2C_ADDRESS)
+print(f"device id: {md20_obj.device_id:#04x}")
+print(f"name: {md20_obj.name}")
+print(f"firmware version: {md20_obj.firmware_version}")
+
+# setup encoder motor
+for i in range(md20.MOTOR_NUM):
+    md20_obj[i].setup_encoder_mode(12, 90, md20.PHASE_RELATION_A_PHASE_LEADS)
+    md20_obj[i].speed_pid_p = 1.5
+    md20_obj[i].speed_pid_i = 1.5
+    md20_obj[i].speed_pid_d = 1.0
+    md20_obj[i].position_pid_p = 10.0
+    md20_obj[i].position_pid_i = 1.0
+    md20_obj[i].position_pid_d = 1.0
+
+waypoints = ((360, 720, 180, 90), (0, 0, 0, 0))
+max_speed = 60
+
+while True:
+    for targets in waypoints:
+        print(f"move to {targets}")
+        report = md20_obj.move_to_all(targets, max_speed, timeout_ms=20000)
+        print(
+            f"result: {report.result}, polls: {report.polls},",
+            f"start skew: {report.start_skew_us} us, arrival skew: {report.arrival_skew_us} us",
+        )
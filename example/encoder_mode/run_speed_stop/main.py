@@ -9,7 +9,7 @@ print(f"md20 lib version: {md20.__version__}")
 
 # setup
 i2c = machine.I2C(0, sda=21, scl=22, freq=400000)
-md20_obj = md20.Md20(i2c, i2c_address=md20.DEFAULT_I2C_ADDRESS)
+md20_obj = md20.Md20(i2c, i2c_address=md20.DEFAULT_I2C_ADDRESS, suppress_redundant=True)
 print(f"device id: {md20_obj.device_id:#04x}")
 print(f"name: {md20_obj.name}")
 print(f"firmware version: {md20_obj.firmware_version}")
@@ -56,5 +56,6 @@ while True:
             f"pwm duties: {md20_obj[0].pwm_duty:5}, {md20_obj[1].pwm_duty:5}, {md20_obj[2].pwm_duty:5}, {md20_obj[3].pwm_duty:5},",
             f"positions: {md20_obj[0].position}, {md20_obj[1].position}, {md20_obj[2].position}, {md20_obj[3].position},",
             f"pulse counts: {md20_obj[0].pulse_count}, {md20_obj[1].pulse_count}, {md20_obj[2].pulse_count}, {md20_obj[3].pulse_count},",
-            f"states: {md20_obj[0].state}, {md20_obj[1].state}, {md20_obj[2].state}, {md20_obj[3].state}",
+            f"states: {md20_obj[0].state}, {md20_obj[1].state}, {md20_obj[2].state}, {md20_obj[3].state},",
+            f"suppressed commands: {md20_obj.suppressed_commands}",
         )
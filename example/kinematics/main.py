@@ -0,0 +1,39 @@
+import machine
+import time
+import md20
+import md20_kinematics
+
+__version__ = "1.0.2"
+
+print(f"example version: {__version__}")
+print(f"md20 lib version: {md20.__version__}")
+
+# setup
+i2c = machine.I2C(0, sda=21, scl=22, freq=400000)
+md20_obj = md20.Md20(i2c, i2c_address=md20.DEFAULT_I2C_ADDRESS)
+
+# setup encoder motor
+for i in range(md20.MOTOR_NUM):
+    md20_obj[i].setup_encoder_mode(12, 90, md20.PHASE_RELATION_A_PHASE_LEADS)
+
+# 65 mm wheels, 150 mm apart, the right motor is mounted mirrored
+base = md20_kinematics.DifferentialDrive(md20_obj, wheel_radius=0.0325, track_width=0.15, left=0, right=1, signs=(1, -1))
+
+last_print_time = time.ticks_ms()
+trigger_time = 0
+turning = False
+
+while True:
+    if trigger_time == 0 or time.ticks_diff(time.ticks_ms(), trigger_time) > 2000:
+        trigger_time = time.ticks_ms()
+        if turning:
+            base.drive(0.2)
+        else:
+            base.drive(0.0, omega=1.5)
+        turning = not turning
+
+    base.update()
+    if time.ticks_diff(time.ticks_ms(), last_print_time) > 200:
+        last_print_time = time.ticks_ms()
+        print(f"x: {base.x:.3f} m, y: {base.y:.3f} m, theta: {base.theta:.3f} rad, vx: {base.vx:.3f} m/s, omega: {base.omega:.3f} rad/s")
+    time.sleep_ms(10)
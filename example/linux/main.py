@@ -0,0 +1,36 @@
+# CPython on a Linux SBC, with lib/ on PYTHONPATH:
+#   PYTHONPATH=lib python3 example/linux/main.py
+import time
+import md20
+import md20_linux
+
+__version__ = "1.0.2"
+
+print(f"example version: {__version__}")
+print(f"md20 lib version: {md20.__version__}")
+
+# setup
+i2c = md20_linux.LinuxI2C(1)
+md20_obj = md20.Md20(i2c, i2c_address=md20.DEFAULT_I2C_ADDRESS)
+print(f"device id: {md20_obj.device_id:#04x}")
+print(f"name: {md20_obj.name}")
+print(f"firmware version: {md20_obj.firmware_version}")
+
+# setup encoder motor
+for i in range(md20.MOTOR_NUM):
+    md20_obj[i].setup_encoder_mode(12, 90, md20.PHASE_RELATION_A_PHASE_LEADS)
+
+md20_obj.run_speed_all((100, 100, 100, 100))
+
+try:
+    while True:
+        time.sleep(0.2)
+        snapshots = md20_obj.snapshot_all()
+        print(
+            f"speeds: {snapshots[0].speed:4}, {snapshots[1].speed:4}, {snapshots[2].speed:4}, {snapshots[3].speed:4},",
+            f"positions: {snapshots[0].position}, {snapshots[1].position}, {snapshots[2].position}, {snapshots[3].position},",
+            f"ioctl transfers: {i2c.transfers}",
+        )
+finally:
+    md20_obj.stop_all()
+    i2c.close()
@@ -0,0 +1,30 @@
+import machine
+import time
+import md20
+
+__version__ = "1.0.2"
+
+print(f"example version: {__version__}")
+print(f"md20 lib version: {md20.__version__}")
+
+# setup
+i2c = machine.I2C(0, sda=21, scl=22, freq=400000)
+md20_obj = md20.Md20(i2c, i2c_address=md20.DEFAULT_I2C_ADDRESS, max_age_ms=20)
+print(f"device id: {md20_obj.device_id:#04x}")
+print(f"name: {md20_obj.name}")
+print(f"firmware version: {md20_obj.firmware_version}")
+
+# setup encoder motor
+for i in range(md20.MOTOR_NUM):
+    md20_obj[i].setup_encoder_mode(12, 90, md20.PHASE_RELATION_A_PHASE_LEADS)
+
+md20_obj.run_speed_all((100, -100, 100, -100))
+
+while True:
+    time.sleep_ms(200)
+    for i in range(md20.MOTOR_NUM):
+        print(
+            f"motor {i} state: {md20_obj[i].state}, speed: {md20_obj[i].speed}, position: {md20_obj[i].position},",
+            f"pulse count: {md20_obj[i].pulse_count}, pwm duty: {md20_obj[i].pwm_duty}, speed pid p: {md20_obj[i].speed_pid_p}",
+        )
+    print(f"shadow refreshes: {md20_obj.shadow.refreshes}, shadow hits: {md20_obj.shadow.hits}")
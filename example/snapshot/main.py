@@ -0,0 +1,43 @@
+import machine
+import time
+import md20
+
+__version__ = "1.0.2"
+
+print(f"example version: {__version__}")
+print(f"md20 lib version: {md20.__version__}")
+
+# setup
+i2c = machine.I2C(0, sda=21, scl=22, freq=400000)
+md20_obj = md20.Md20(i2c, i2c_address=md20.DEFAULT_I2C_ADDRESS)
+print(f"device id: {md20_obj.device_id:#04x}")
+print(f"name: {md20_obj.name}")
+print(f"firmware version: {md20_obj.firmware_version}")
+
+# setup encoder motor
+for i in range(md20.MOTOR_NUM):
+    md20_obj[i].setup_encoder_mode(12, 90, md20.PHASE_RELATION_A_PHASE_LEADS)
+    print(f"motor {i} snapshot: {md20_obj[i].snapshot()}")
+
+last_print_time = time.ticks_ms()
+trigger_time = 0
+target_speed = 100
+
+while True:
+    if trigger_time == 0 or time.ticks_ms() - trigger_time > 2000:
+        trigger_time = time.ticks_ms()
+        for i in range(md20.MOTOR_NUM):
+            print(f"motor {i} run speed: {target_speed}")
+            md20_obj[i].run_speed(target_speed)
+        target_speed = -target_speed
+
+    if time.ticks_ms() - last_print_time > 200:
+        last_print_time = time.ticks_ms()
+        snapshots = md20_obj.snapshot_all()
+        print(
+            f"speeds:{snapshots[0].speed:4}, {snapshots[1].speed:4}, {snapshots[2].speed:4}, {snapshots[3].speed:4},",
+            f"pwm duties: {snapshots[0].pwm_duty:5}, {snapshots[1].pwm_duty:5}, {snapshots[2].pwm_duty:5}, {snapshots[3].pwm_duty:5},",
+            f"positions: {snapshots[0].position}, {snapshots[1].position}, {snapshots[2].position}, {snapshots[3].position},",
+            f"pulse counts: {snapshots[0].pulse_count}, {snapshots[1].pulse_count}, {snapshots[2].pulse_count}, {snapshots[3].pulse_count},",
+            f"states: {snapshots[0].state}, {snapshots[1].state}, {snapshots[2].state}, {snapshots[3].state}",
+        )
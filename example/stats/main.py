@@ -0,0 +1,35 @@
+import machine
+import time
+import md20
+
+__version__ = "1.0.2"
+
+print(f"example version: {__version__}")
+print(f"md20 lib version: {md20.__version__}")
+
+# setup
+i2c = machine.I2C(0, sda=21, scl=22, freq=400000)
+md20_obj = md20.Md20(i2c, i2c_address=md20.DEFAULT_I2C_ADDRESS, stats=True)
+
+# setup encoder motor
+for i in range(md20.MOTOR_NUM):
+    md20_obj[i].setup_encoder_mode(12, 90, md20.PHASE_RELATION_A_PHASE_LEADS)
+
+target_speed = 100
+
+while True:
+    md20_obj.reset_stats()
+    md20_obj.run_speed_all((target_speed, target_speed, target_speed, target_speed))
+    target_speed = -target_speed
+    for _ in range(100):
+        for i in range(md20.MOTOR_NUM):
+            md20_obj[i].speed
+            md20_obj[i].position
+        md20_obj.snapshot_all()
+        time.sleep_ms(10)
+
+    for name, stat in md20_obj.stats().items():
+        print(
+            f"{name:<16} count: {stat['count']:5}, transactions: {stat['transactions']:6}, bytes: {stat['bytes']:7}, polls: {stat['polls']:5},",
+            f"min/avg/max us: {stat['min_us']}/{stat['avg_us']}/{stat['max_us']}, histogram: {stat['histogram']}",
+        )
@@ -0,0 +1,33 @@
+import machine
+import time
+import md20
+import md20_trace
+
+__version__ = "1.0.2"
+
+print(f"example version: {__version__}")
+print(f"md20 lib version: {md20.__version__}")
+
+# setup
+i2c = md20_trace.TraceI2C(machine.I2C(0, sda=21, scl=22, freq=400000), depth=512)
+md20_obj = md20.Md20(i2c, i2c_address=md20.DEFAULT_I2C_ADDRESS)
+
+# setup encoder motor
+for i in range(md20.MOTOR_NUM):
+    md20_obj[i].setup_encoder_mode(12, 90, md20.PHASE_RELATION_A_PHASE_LEADS)
+
+target_speed = 100
+
+try:
+    while True:
+        md20_obj.run_speed_all((target_speed, target_speed, target_speed, target_speed))
+        target_speed = -target_speed
+        for _ in range(100):
+            md20_obj.snapshot_all()
+            time.sleep_ms(20)
+finally:
+    md20_obj.stop_all()
+    # copy trace.bin to the host and run: python3 tools/replay_trace.py trace.bin
+    with open("trace.bin", "wb") as file:
+        i2c.save(file)
+    print(f"traced {i2c.records} transactions, kept the last {min(i2c.records, i2c.depth)}")
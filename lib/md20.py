@@ -1,5 +1,37 @@
 import struct
-from micropython import const
+from collections import namedtuple
+
+try:
+    from micropython import const
+except ImportError:
+
+    def const(value):
+        return value
+
+
+try:
+    from time import sleep_ms, sleep_us, ticks_add, ticks_diff, ticks_ms, ticks_us
+except ImportError:
+    from time import perf_counter_ns, sleep
+
+    def sleep_ms(ms):
+        sleep(ms / 1000)
+
+    def sleep_us(us):
+        sleep(us / 1000000)
+
+    def ticks_add(ticks, delta):
+        return ticks + delta
+
+    def ticks_ms():
+        return perf_counter_ns() // 1000000
+
+    def ticks_us():
+        return perf_counter_ns() // 1000
+
+    def ticks_diff(end, start):
+        return end - start
+
 
 __version__ = "1.0.2"
 
@@ -16,6 +48,16 @@ STATE_REACHED_POSITION: int = const(4)
 PHASE_RELATION_A_PHASE_LEADS: int = const(0)
 PHASE_RELATION_B_PHASE_LEADS: int = const(1)
 
+WAIT_REACHED: int = const(0)
+WAIT_TIMEOUT: int = const(1)
+WAIT_STALLED: int = const(2)
+WAIT_INTERRUPTED: int = const(3)
+
+PRIORITY_URGENT: int = const(0)
+PRIORITY_COMMAND: int = const(1)
+PRIORITY_TELEMETRY: int = const(2)
+PRIORITY_NUM: int = const(3)
+
 _CMD_SETUP: int = const(1)
 _CMD_RESET: int = const(2)
 _CMD_SET_SPEED_PID_P: int = const(3)
@@ -56,200 +98,896 @@ _MEM_ADDR_PWM_DUTY: int = const(0x40)
 
 _MOTOR_STATE_OFFSET: int = const(0x20)
 
+MEM_ADDR_COMMAND_TYPE: int = const(_MEM_ADDR_COMMAND_TYPE)
+MEM_ADDR_COMMAND_EXECUTE: int = const(_MEM_ADDR_COMMAND_EXECUTE)
+MEM_ADDR_STATE_BLOCK: int = const(_MEM_ADDR_STATE)
+
+STATE_BLOCK_STRIDE: int = const(_MOTOR_STATE_OFFSET)
+STATE_BLOCK_SIZE: int = const(_MOTOR_STATE_OFFSET * MOTOR_NUM)
+STATE_BLOCK_STATE: int = const(0)
+STATE_BLOCK_SPEED: int = const(_MEM_ADDR_SPEED - _MEM_ADDR_STATE)
+STATE_BLOCK_POSITION: int = const(_MEM_ADDR_POSITION - _MEM_ADDR_STATE)
+STATE_BLOCK_PULSE_COUNT: int = const(_MEM_ADDR_PULSE_COUNT - _MEM_ADDR_STATE)
+STATE_BLOCK_PWM_DUTY: int = const(_MEM_ADDR_PWM_DUTY - _MEM_ADDR_STATE)
+
+DEGREES_PER_SECOND_PER_RPM: int = const(6)
+
+_COMMAND_TYPE_NUM: int = const(_CMD_MOVE + 1)
+_COMMAND_FRAME_SIZE: int = const(_MEM_ADDR_COMMAND_EXECUTE - _MEM_ADDR_COMMAND_TYPE + 1)
+_COMMAND_PARAM_OFFSET: int = const(_MEM_ADDR_COMMAND_PARAM - _MEM_ADDR_COMMAND_TYPE)
+
+_GAINS_SIZE: int = const(_MEM_ADDR_POSITION_D + 2 - _MEM_ADDR_SPEED_P)
+_SHADOW_SIZE: int = const(_MEM_ADDR_STATE + _MOTOR_STATE_OFFSET * MOTOR_NUM)
+
+_STAT_STATE: int = const(_COMMAND_TYPE_NUM)
+_STAT_SPEED: int = const(_COMMAND_TYPE_NUM + 1)
+_STAT_POSITION: int = const(_COMMAND_TYPE_NUM + 2)
+_STAT_PULSE_COUNT: int = const(_COMMAND_TYPE_NUM + 3)
+_STAT_PWM_DUTY: int = const(_COMMAND_TYPE_NUM + 4)
+_STAT_SNAPSHOT: int = const(_COMMAND_TYPE_NUM + 5)
+_STAT_PID_GAINS: int = const(_COMMAND_TYPE_NUM + 6)
+_STAT_STATE_BLOCK: int = const(_COMMAND_TYPE_NUM + 7)
+_STAT_IDENTITY: int = const(_COMMAND_TYPE_NUM + 8)
+_STAT_BATCH: int = const(_COMMAND_TYPE_NUM + 9)
+_STAT_NUM: int = const(_COMMAND_TYPE_NUM + 10)
+_STAT_SLOT_FRAME: int = const(1)
+_STAT_SLOT_NUM: int = const(2)
+_STAT_HISTOGRAM_SIZE: int = const(12)
+_STAT_HISTOGRAM_SHIFT: int = const(5)
+
+_STAT_NAMES = (
+    None,
+    "setup",
+    "reset",
+    "set_speed_pid_p",
+    "set_speed_pid_i",
+    "set_speed_pid_d",
+    "set_position_pid_p",
+    "set_position_pid_i",
+    "set_position_pid_d",
+    "set_position",
+    "set_pulse_count",
+    "stop",
+    "run_pwm_duty",
+    "run_speed",
+    "move_to",
+    "move",
+    "state",
+    "speed",
+    "position",
+    "pulse_count",
+    "pwm_duty",
+    "snapshot",
+    "pid_gains",
+    "state_block",
+    "identity",
+    "batch",
+)
+
+_SETPOINT_STATES = {
+    _CMD_STOP: (STATE_IDLE,),
+    _CMD_RUN_PWM_DUTY: (STATE_RUNNING_WITH_PWM_DUTY,),
+    _CMD_RUN_SPEED: (STATE_RUNNING_WITH_SPEED,),
+    _CMD_MOVE_TO: (STATE_RUNNING_TO_POSITION, STATE_REACHED_POSITION),
+}
+
+_I16_MIN: int = const(-0x8000)
+_I16_MAX: int = const(0x7FFF)
+_I32_MIN: int = const(-0x80000000)
+_I32_MAX: int = const(0x7FFFFFFF)
+
+_WAIT_MIN_POLL_MS: int = const(2)
+_WAIT_MAX_POLL_MS: int = const(100)
+_WAIT_STALL_MIN_MS: int = const(200)
+_WAIT_STALL_DEFAULT_MS: int = const(500)
+_WAIT_STALL_DEGREES: int = const(5)
+
+_SNAPSHOT_FORMAT = "<B15xiiih"
+
+Snapshot = namedtuple("Snapshot", ("state", "speed", "position", "pulse_count", "pwm_duty"))
+
+MoveReport = namedtuple("MoveReport", ("result", "polls", "start_skew_us", "arrival_skew_us"))
+
+
+def _decode_u16_python(buffer, offset):
+    return buffer[offset] | buffer[offset + 1] << 8
+
+
+def _decode_i16_python(buffer, offset):
+    value = buffer[offset] | buffer[offset + 1] << 8
+    return value - 0x10000 if value & 0x8000 else value
+
+
+def _decode_i32_python(buffer, offset):
+    top = buffer[offset + 3]
+    if top & 0x80:
+        top -= 0x100
+    return top << 24 | buffer[offset + 2] << 16 | buffer[offset + 1] << 8 | buffer[offset]
+
+
+def _encode_i16_python(buffer, offset, value):
+    struct.pack_into("<h", buffer, offset, value)
+
+
+def _encode_i32_python(buffer, offset, value):
+    struct.pack_into("<i", buffer, offset, value)
+
+
+def _check_range(name, value, low, high):
+    if not low <= value <= high:
+        raise ValueError(f"{name} {value} is out of range [{low}, {high}]")
+
+
+def _wait_command_emptied_python(i2c, i2c_address, buffer):
+    i2c.readfrom_mem_into(i2c_address, _MEM_ADDR_COMMAND_EXECUTE, buffer)
+    while buffer[0] != 0:
+        i2c.readfrom_mem_into(i2c_address, _MEM_ADDR_COMMAND_EXECUTE, buffer)
+
+
+try:
+    from md20_native import (
+        decode_i16 as _decode_i16,
+        decode_i32 as _decode_i32,
+        decode_u16 as _decode_u16,
+        encode_i16 as _encode_i16,
+        encode_i32 as _encode_i32,
+        wait_command_emptied as _wait_command_emptied,
+    )
+except (ImportError, SyntaxError, NotImplementedError):
+    _decode_u16 = _decode_u16_python
+    _decode_i16 = _decode_i16_python
+    _decode_i32 = _decode_i32_python
+    _encode_i16 = _encode_i16_python
+    _encode_i32 = _encode_i32_python
+    _wait_command_emptied = _wait_command_emptied_python
+
+
+class _NoClaim:
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+_NO_CLAIM = _NoClaim()
+
+
+def _claim(arbiter, priority):
+    return _NO_CLAIM if arbiter is None else arbiter.claims[priority]
+
+
+class _CountingI2C:
+
+    def __init__(self, i2c):
+        self._i2c = i2c
+        self.transactions = 0
+        self.bytes_transferred = 0
+        self.polls = 0
+        if hasattr(i2c, "latch_readfrom_mem_into"):
+            self.latch_readfrom_mem_into = self._latch_readfrom_mem_into
+
+    def writeto_mem(self, i2c_address, mem_addr, buffer):
+        self.transactions += 1
+        self.bytes_transferred += len(buffer)
+        self._i2c.writeto_mem(i2c_address, mem_addr, buffer)
+
+    def readfrom_mem(self, i2c_address, mem_addr, size):
+        self.transactions += 1
+        self.bytes_transferred += size
+        return self._i2c.readfrom_mem(i2c_address, mem_addr, size)
+
+    def readfrom_mem_into(self, i2c_address, mem_addr, buffer):
+        self.transactions += 1
+        self.bytes_transferred += len(buffer)
+        if mem_addr == _MEM_ADDR_COMMAND_EXECUTE:
+            self.polls += 1
+        self._i2c.readfrom_mem_into(i2c_address, mem_addr, buffer)
+
+    def _latch_readfrom_mem_into(self, i2c_address, latch_addr, mem_addr, buffer):
+        self.transactions += 2
+        self.bytes_transferred += 1 + len(buffer)
+        self._i2c.latch_readfrom_mem_into(i2c_address, latch_addr, mem_addr, buffer)
+
+
+def _latch_reader(i2c):
+    reader = getattr(i2c, "latch_readfrom_mem_into", None)
+    if reader is not None:
+        return reader
+
+    def latch_readfrom_mem_into(i2c_address, latch_addr, mem_addr, buffer):
+        i2c.writeto_mem(i2c_address, latch_addr, b"\x00")
+        i2c.readfrom_mem_into(i2c_address, mem_addr, buffer)
+
+    return latch_readfrom_mem_into
+
+
+def _command_priority(frames):
+    for frame in frames:
+        if frame[0] == _CMD_STOP:
+            return PRIORITY_URGENT
+    return PRIORITY_COMMAND
+
+
+def _stall_window_ms(target_rpm, measured_rpm):
+    rpm = abs(target_rpm)
+    if measured_rpm != 0 and (rpm == 0 or abs(measured_rpm) < rpm):
+        rpm = abs(measured_rpm)
+    if rpm == 0:
+        return _WAIT_STALL_DEFAULT_MS
+    return max(_WAIT_STALL_MIN_MS, _WAIT_STALL_DEGREES * 1000 // (rpm * DEGREES_PER_SECOND_PER_RPM))
+
+
+def _wait_until_reached(motors, offsets, read, timeout_ms, arrivals=None):
+    start = ticks_ms()
+    start_us = ticks_us()
+    polls = 0
+    positions = [None] * len(motors)
+    progress_ms = [start] * len(motors)
+    while True:
+        state_buffer = read()
+        now = ticks_ms()
+        polls += 1
+        delay = _WAIT_MAX_POLL_MS
+        reached = True
+        for i, motor in enumerate(motors):
+            offset = offsets[i]
+            state = state_buffer[offset]
+            if state == STATE_REACHED_POSITION:
+                if arrivals is not None and arrivals[i] is None:
+                    arrivals[i] = ticks_diff(ticks_us(), start_us)
+                continue
+            if state != STATE_RUNNING_TO_POSITION:
+                return WAIT_INTERRUPTED, polls
+            reached = False
+            position = _decode_i32(state_buffer, offset + _MEM_ADDR_POSITION - _MEM_ADDR_STATE)
+            speed = _decode_i32(state_buffer, offset + _MEM_ADDR_SPEED - _MEM_ADDR_STATE)
+            if position != positions[i]:
+                positions[i] = position
+                progress_ms[i] = now
+            elif ticks_diff(now, progress_ms[i]) >= _stall_window_ms(motor._target_speed, speed):
+                return WAIT_STALLED, polls
+            if motor._target is None or speed == 0:
+                delay = min(delay, _WAIT_MAX_POLL_MS // 4)
+            else:
+                remaining_ms = abs(motor._target - position) * 1000 // (abs(speed) * DEGREES_PER_SECOND_PER_RPM)
+                delay = min(delay, remaining_ms)
+        if reached:
+            return WAIT_REACHED, polls
+        remaining_ms = timeout_ms - ticks_diff(now, start)
+        if remaining_ms <= 0:
+            return WAIT_TIMEOUT, polls
+        sleep_ms(min(max(delay, _WAIT_MIN_POLL_MS), remaining_ms))
+
 
 class Md20:
 
+    class Batch:
+
+        def __init__(self, md20):
+            self._md20 = md20
+            self._frames = []
+            self.skew_us = 0
+            self.elapsed_us = 0
+
+        def __enter__(self):
+            self._md20._attach_sink(self._append)
+            return self
+
+        def _append(self, frame):
+            self._frames.append(bytes(frame))
+
+        def __exit__(self, exc_type, exc_value, traceback):
+            frames = self._frames
+            self._frames = []
+            submitted = exc_type is None and not frames
+            try:
+                if exc_type is None and frames:
+                    self.skew_us, self.elapsed_us = self._md20._submit(frames)
+                    submitted = True
+            finally:
+                self._md20._detach_sink(not submitted)
+
+    class Stats:
+
+        def __init__(self, i2c):
+            self._i2c = i2c
+            self.reset()
+
+        def reset(self):
+            self.counts = [0] * _STAT_NUM
+            self.transactions = [0] * _STAT_NUM
+            self.bytes_transferred = [0] * _STAT_NUM
+            self.polls = [0] * _STAT_NUM
+            self.total_us = [0] * _STAT_NUM
+            self.min_us = [0] * _STAT_NUM
+            self.max_us = [0] * _STAT_NUM
+            self.histograms = [[0] * _STAT_HISTOGRAM_SIZE for _ in range(_STAT_NUM)]
+            self._start_us = [0] * _STAT_SLOT_NUM
+            self._start_transactions = [0] * _STAT_SLOT_NUM
+            self._start_bytes = [0] * _STAT_SLOT_NUM
+            self._start_polls = [0] * _STAT_SLOT_NUM
+
+        def begin(self, slot=0):
+            i2c = self._i2c
+            self._start_transactions[slot] = i2c.transactions
+            self._start_bytes[slot] = i2c.bytes_transferred
+            self._start_polls[slot] = i2c.polls
+            self._start_us[slot] = ticks_us()
+
+        def end(self, stat, slot=0):
+            elapsed_us = ticks_diff(ticks_us(), self._start_us[slot])
+            i2c = self._i2c
+            self.transactions[stat] += i2c.transactions - self._start_transactions[slot]
+            self.bytes_transferred[stat] += i2c.bytes_transferred - self._start_bytes[slot]
+            self.polls[stat] += i2c.polls - self._start_polls[slot]
+            self.total_us[stat] += elapsed_us
+            if self.counts[stat] == 0 or elapsed_us < self.min_us[stat]:
+                self.min_us[stat] = elapsed_us
+            if elapsed_us > self.max_us[stat]:
+                self.max_us[stat] = elapsed_us
+            self.counts[stat] += 1
+            bucket = 0
+            elapsed_us >>= _STAT_HISTOGRAM_SHIFT
+            while elapsed_us and bucket < _STAT_HISTOGRAM_SIZE - 1:
+                elapsed_us >>= 1
+                bucket += 1
+            self.histograms[stat][bucket] += 1
+
+        def report(self):
+            report = {}
+            for stat in range(_STAT_NUM):
+                count = self.counts[stat]
+                if count:
+                    report[_STAT_NAMES[stat]] = {
+                        "count": count,
+                        "transactions": self.transactions[stat],
+                        "bytes": self.bytes_transferred[stat],
+                        "polls": self.polls[stat],
+                        "min_us": self.min_us[stat],
+                        "avg_us": self.total_us[stat] // count,
+                        "max_us": self.max_us[stat],
+                        "histogram": tuple(self.histograms[stat]),
+                    }
+            return report
+
+    class Shadow:
+
+        def __init__(self, i2c, i2c_address, max_age_ms, motors, arbiter=None):
+            self._latch_readfrom_mem_into = _latch_reader(i2c)
+            self._i2c_address = i2c_address
+            self._arbiter = arbiter
+            self._motors = motors
+            self.max_age_ms = max_age_ms
+            self.buffer = bytearray(_SHADOW_SIZE)
+            self.state = memoryview(self.buffer)[_MEM_ADDR_STATE:]
+            self._valid = False
+            self._refreshed_ms = 0
+            self.refreshes = 0
+            self.hits = 0
+
+        def invalidate(self):
+            self._valid = False
+
+        def refresh(self):
+            with _claim(self._arbiter, PRIORITY_TELEMETRY):
+                return self._refresh()
+
+        def _refresh(self):
+            self._latch_readfrom_mem_into(self._i2c_address, _MEM_ADDR_STATE, _MEM_ADDR_DEVICE_ID, self.buffer)
+            self._refreshed_ms = ticks_ms()
+            self._valid = True
+            self.refreshes += 1
+            for motor in self._motors:
+                if motor is not None:
+                    motor._observe_state(self.buffer[_MEM_ADDR_STATE + motor._mem_offset])
+            return self.buffer
+
+        def load(self):
+            with _claim(self._arbiter, PRIORITY_TELEMETRY):
+                return self._load()
+
+        def _load(self):
+            if self._valid and ticks_diff(ticks_ms(), self._refreshed_ms) < self.max_age_ms:
+                self.hits += 1
+                return self.buffer
+            return self._refresh()
+
+        def read_into(self, mem_addr, buffer):
+            with _claim(self._arbiter, PRIORITY_TELEMETRY):
+                return self._read_into(mem_addr, buffer)
+
+        def _read_into(self, mem_addr, buffer):
+            data = self._load()
+            for i in range(len(buffer)):
+                buffer[i] = data[mem_addr + i]
+            return buffer
+
     class Motor:
 
-        def __init__(self, index, i2c, i2c_address):
+        def __init__(self, index, i2c, i2c_address, suppress_redundant=False, reset=True, shadow=None, arbiter=None, stats=None):
             self._index = index
             self._i2c = i2c
             self._i2c_address = i2c_address
-            self.reset()
-
-        def _execute_command(self):
-            self._i2c.writeto_mem(self._i2c_address, _MEM_ADDR_COMMAND_EXECUTE, b"\x01")
-            self._wait_command_emptied()
+            self._latch_readfrom_mem_into = _latch_reader(i2c)
+            self._mem_offset = index * _MOTOR_STATE_OFFSET
+            self._buffer1 = bytearray(1)
+            self._buffer2 = bytearray(2)
+            self._buffer4 = bytearray(4)
+            self._state_buffer = bytearray(_MOTOR_STATE_OFFSET)
+            self._gains = bytearray(_GAINS_SIZE)
+            self._gains_valid = False
+            self._frames = [None] * _COMMAND_TYPE_NUM
+            self._sink = None
+            self._setpoint = bytearray(_COMMAND_FRAME_SIZE)
+            self._setpoint_valid = False
+            self._target = None
+            self._target_speed = 0
+            self._shadow = shadow
+            self._arbiter = arbiter
+            self._stats = stats
+            self.ppr = 0
+            self.reduction_ratio = 0
+            self.suppress_redundant = suppress_redundant
+            self.suppressed_commands = 0
+            if reset:
+                self.reset()
+
+        def _frame(self, command):
+            frame = self._frames[command]
+            if frame is None:
+                frame = bytearray(_COMMAND_FRAME_SIZE)
+                frame[0] = command
+                frame[1] = self._index
+                frame[_COMMAND_FRAME_SIZE - 1] = 1
+                self._frames[command] = frame
+            return frame
+
+        def _execute_command(self, frame):
+            self._setpoint_valid = False
+            if self._sink is not None:
+                self._sink(frame)
+                return
+            stats = self._stats
+            with _claim(self._arbiter, PRIORITY_URGENT if frame[0] == _CMD_STOP else PRIORITY_COMMAND):
+                if stats is not None:
+                    stats.begin()
+                self._wait_command_emptied()
+                self._i2c.writeto_mem(self._i2c_address, _MEM_ADDR_COMMAND_TYPE, frame)
+                self._wait_command_emptied()
+                if stats is not None:
+                    stats.end(frame[0])
+            if self._shadow is not None:
+                self._shadow.invalidate()
+
+        def _execute_setpoint(self, frame, force):
+            if self.suppress_redundant and not force and self._setpoint_valid and frame == self._setpoint:
+                self.suppressed_commands += 1
+                return
+            self._execute_command(frame)
+            self._setpoint[:] = frame
+            self._setpoint_valid = True
+
+        def _invalidate(self):
+            self._setpoint_valid = False
+            self._gains_valid = False
+
+        def _observe_state(self, state):
+            if self._setpoint_valid and state not in _SETPOINT_STATES[self._setpoint[0]]:
+                self._setpoint_valid = False
 
         def _wait_command_emptied(self):
-            while self._i2c.readfrom_mem(self._i2c_address, _MEM_ADDR_COMMAND_EXECUTE, 1)[0] != 0:
-                pass
+            _wait_command_emptied(self._i2c, self._i2c_address, self._buffer1)
+
+        def _read(self, mem_addr, buffer, stat):
+            stats = self._stats
+            with _claim(self._arbiter, PRIORITY_TELEMETRY):
+                if stats is not None:
+                    stats.begin()
+                if self._shadow is not None:
+                    self._shadow._read_into(mem_addr, buffer)
+                else:
+                    self._i2c.readfrom_mem_into(self._i2c_address, mem_addr, buffer)
+                if stats is not None:
+                    stats.end(stat)
+            return buffer
+
+        def _latch_read(self, mem_addr, buffer, stat):
+            stats = self._stats
+            with _claim(self._arbiter, PRIORITY_TELEMETRY):
+                if stats is not None:
+                    stats.begin()
+                if self._shadow is not None:
+                    self._shadow._read_into(mem_addr, buffer)
+                else:
+                    self._latch_readfrom_mem_into(self._i2c_address, mem_addr, mem_addr, buffer)
+                if stats is not None:
+                    stats.end(stat)
+            return buffer
+
+        def _load_gains(self):
+            if not self._gains_valid:
+                self._read(_MEM_ADDR_SPEED_P + self._mem_offset, self._gains, _STAT_PID_GAINS)
+                self._gains_valid = True
+            return self._gains
+
+        def _gain(self, mem_addr):
+            return _decode_u16(self._load_gains(), mem_addr - _MEM_ADDR_SPEED_P) / 100.0
+
+        def _set_gain(self, command, mem_addr, value):
+            gains = self._load_gains()
+            offset = mem_addr - _MEM_ADDR_SPEED_P
+            value = int(value * 100)
+            if _decode_u16(gains, offset) == value:
+                return
+            frame = self._frame(command)
+            struct.pack_into("<H", frame, _COMMAND_PARAM_OFFSET, value)
+            self._execute_command(frame)
+            struct.pack_into("<H", gains, offset, value)
 
         def reset(self):
-            self._wait_command_emptied()
-            self._i2c.writeto_mem(self._i2c_address, _MEM_ADDR_COMMAND_TYPE, bytes([_CMD_RESET, self._index]))
-            self._execute_command()
+            self._execute_command(self._frame(_CMD_RESET))
+            self._gains_valid = False
+            self.ppr = 0
+            self.reduction_ratio = 0
 
         def setup_encoder_mode(self, ppr, reduction_ration, phase_relation):
-            self._wait_command_emptied()
-            self._i2c.writeto_mem(
-                self._i2c_address,
-                _MEM_ADDR_COMMAND_TYPE,
-                struct.pack("<BBHHB", _CMD_SETUP, self._index, ppr, reduction_ration, phase_relation),
-            )
-            self._execute_command()
+            frame = self._frame(_CMD_SETUP)
+            struct.pack_into("<HHB", frame, _COMMAND_PARAM_OFFSET, ppr, reduction_ration, phase_relation)
+            self._execute_command(frame)
+            self._gains_valid = False
+            self.ppr = ppr
+            self.reduction_ratio = reduction_ration
 
         def setup_dc_mode(self):
-            self._wait_command_emptied()
-            self._i2c.writeto_mem(self._i2c_address, _MEM_ADDR_COMMAND_TYPE, bytes([_CMD_SETUP, self._index, 0, 0, 0]))
-            self._execute_command()
+            frame = self._frame(_CMD_SETUP)
+            struct.pack_into("<HHB", frame, _COMMAND_PARAM_OFFSET, 0, 0, 0)
+            self._execute_command(frame)
+            self._gains_valid = False
+            self.ppr = 0
+            self.reduction_ratio = 0
 
         @property
         def speed_pid_p(self):
-            return struct.unpack("<H", self._i2c.readfrom_mem(self._i2c_address, _MEM_ADDR_SPEED_P + self._index * _MOTOR_STATE_OFFSET, 2))[0] / 100.0
+            return self._gain(_MEM_ADDR_SPEED_P)
 
         @speed_pid_p.setter
         def speed_pid_p(self, value):
-            self._wait_command_emptied()
-            self._i2c.writeto_mem(self._i2c_address, _MEM_ADDR_COMMAND_TYPE, struct.pack("<BBH", _CMD_SET_SPEED_PID_P, self._index, int(value * 100)))
-            self._execute_command()
+            self._set_gain(_CMD_SET_SPEED_PID_P, _MEM_ADDR_SPEED_P, value)
 
         @property
         def speed_pid_i(self):
-            return struct.unpack("<H", self._i2c.readfrom_mem(self._i2c_address, _MEM_ADDR_SPEED_I + self._index * _MOTOR_STATE_OFFSET, 2))[0] / 100.0
+            return self._gain(_MEM_ADDR_SPEED_I)
 
         @speed_pid_i.setter
         def speed_pid_i(self, value):
-            self._wait_command_emptied()
-            self._i2c.writeto_mem(self._i2c_address, _MEM_ADDR_COMMAND_TYPE, struct.pack("<BBH", _CMD_SET_SPEED_PID_I, self._index, int(value * 100)))
-            self._execute_command()
+            self._set_gain(_CMD_SET_SPEED_PID_I, _MEM_ADDR_SPEED_I, value)
 
         @property
         def speed_pid_d(self):
-            return struct.unpack("<H", self._i2c.readfrom_mem(self._i2c_address, _MEM_ADDR_SPEED_D + self._index * _MOTOR_STATE_OFFSET, 2))[0] / 100.0
+            return self._gain(_MEM_ADDR_SPEED_D)
 
         @speed_pid_d.setter
         def speed_pid_d(self, value):
-            self._wait_command_emptied()
-            self._i2c.writeto_mem(self._i2c_address, _MEM_ADDR_COMMAND_TYPE, struct.pack("<BBH", _CMD_SET_SPEED_PID_D, self._index, int(value * 100)))
-            self._execute_command()
+            self._set_gain(_CMD_SET_SPEED_PID_D, _MEM_ADDR_SPEED_D, value)
 
         @property
         def position_pid_p(self):
-            return (
-                struct.unpack("<H", self._i2c.readfrom_mem(self._i2c_address, _MEM_ADDR_POSITION_P + self._index * _MOTOR_STATE_OFFSET, 2))[0] / 100.0
-            )
+            return self._gain(_MEM_ADDR_POSITION_P)
 
         @position_pid_p.setter
         def position_pid_p(self, value):
-            self._wait_command_emptied()
-            self._i2c.writeto_mem(
-                self._i2c_address, _MEM_ADDR_COMMAND_TYPE, struct.pack("<BBH", _CMD_SET_POSITION_PID_P, self._index, int(value * 100))
-            )
-            self._execute_command()
+            self._set_gain(_CMD_SET_POSITION_PID_P, _MEM_ADDR_POSITION_P, value)
 
         @property
         def position_pid_i(self):
-            return (
-                struct.unpack("<H", self._i2c.readfrom_mem(self._i2c_address, _MEM_ADDR_POSITION_I + self._index * _MOTOR_STATE_OFFSET, 2))[0] / 100
-            )
+            return self._gain(_MEM_ADDR_POSITION_I)
 
         @position_pid_i.setter
         def position_pid_i(self, value):
-            self._wait_command_emptied()
-            self._i2c.writeto_mem(
-                self._i2c_address, _MEM_ADDR_COMMAND_TYPE, struct.pack("<BBH", _CMD_SET_POSITION_PID_I, self._index, int(value * 100))
-            )
-            self._execute_command()
+            self._set_gain(_CMD_SET_POSITION_PID_I, _MEM_ADDR_POSITION_I, value)
 
         @property
         def position_pid_d(self):
-            return (
-                struct.unpack("<H", self._i2c.readfrom_mem(self._i2c_address, _MEM_ADDR_POSITION_D + self._index * _MOTOR_STATE_OFFSET, 2))[0] / 100
-            )
+            return self._gain(_MEM_ADDR_POSITION_D)
 
         @position_pid_d.setter
         def position_pid_d(self, value):
-            self._wait_command_emptied()
-            self._i2c.writeto_mem(
-                self._i2c_address, _MEM_ADDR_COMMAND_TYPE, struct.pack("<BBH", _CMD_SET_POSITION_PID_D, self._index, int(value * 100))
-            )
-            self._execute_command()
+            self._set_gain(_CMD_SET_POSITION_PID_D, _MEM_ADDR_POSITION_D, value)
 
         def set_current_position(self, position):
-            self._wait_command_emptied()
-            self._i2c.writeto_mem(self._i2c_address, _MEM_ADDR_COMMAND_TYPE, struct.pack("<BBI", _CMD_SET_POSITION, self._index, position))
-            self._execute_command()
+            frame = self._frame(_CMD_SET_POSITION)
+            struct.pack_into("<I", frame, _COMMAND_PARAM_OFFSET, position)
+            self._execute_command(frame)
 
         def set_pulse_count(self, pulse_count):
-            self._wait_command_emptied()
-            self._i2c.writeto_mem(self._i2c_address, _MEM_ADDR_COMMAND_TYPE, struct.pack("<BBI", _CMD_SET_PULSE_COUNT, self._index, pulse_count))
-            self._execute_command()
-
-        def stop(self):
-            self._wait_command_emptied()
-            self._i2c.writeto_mem(self._i2c_address, _MEM_ADDR_COMMAND_TYPE, bytes([_CMD_STOP, self._index]))
-            self._execute_command()
-
-        def run_speed(self, rpm):
-            self._wait_command_emptied()
-            self._i2c.writeto_mem(self._i2c_address, _MEM_ADDR_COMMAND_TYPE, struct.pack("<BBi", _CMD_RUN_SPEED, self._index, rpm))
-            self._execute_command()
-
-        def run_pwm_duty(self, pwm_duty):
-            self._wait_command_emptied()
-            self._i2c.writeto_mem(self._i2c_address, _MEM_ADDR_COMMAND_TYPE, struct.pack("<BBh", _CMD_RUN_PWM_DUTY, self._index, pwm_duty))
-            self._execute_command()
-
-        def move_to(self, position, speed):
-            self._wait_command_emptied()
-            self._i2c.writeto_mem(self._i2c_address, _MEM_ADDR_COMMAND_TYPE, struct.pack("<BBii", _CMD_MOVE_TO, self._index, position, speed))
-            self._execute_command()
+            frame = self._frame(_CMD_SET_PULSE_COUNT)
+            struct.pack_into("<I", frame, _COMMAND_PARAM_OFFSET, pulse_count)
+            self._execute_command(frame)
+
+        def stop(self, force=False):
+            self._execute_setpoint(self._frame(_CMD_STOP), force)
+
+        def run_speed(self, rpm, force=False):
+            _check_range("rpm", rpm, _I32_MIN, _I32_MAX)
+            frame = self._frame(_CMD_RUN_SPEED)
+            _encode_i32(frame, _COMMAND_PARAM_OFFSET, rpm)
+            self._execute_setpoint(frame, force)
+
+        def run_pwm_duty(self, pwm_duty, force=False):
+            _check_range("pwm_duty", pwm_duty, _I16_MIN, _I16_MAX)
+            frame = self._frame(_CMD_RUN_PWM_DUTY)
+            _encode_i16(frame, _COMMAND_PARAM_OFFSET, pwm_duty)
+            self._execute_setpoint(frame, force)
+
+        def move_to(self, position, speed, force=False):
+            _check_range("position", position, _I32_MIN, _I32_MAX)
+            _check_range("speed", speed, _I32_MIN, _I32_MAX)
+            frame = self._frame(_CMD_MOVE_TO)
+            _encode_i32(frame, _COMMAND_PARAM_OFFSET, position)
+            _encode_i32(frame, _COMMAND_PARAM_OFFSET + 4, speed)
+            self._execute_setpoint(frame, force)
+            self._target = position
+            self._target_speed = speed
 
         def move(self, offset, speed):
-            self._wait_command_emptied()
-            self._i2c.writeto_mem(self._i2c_address, _MEM_ADDR_COMMAND_TYPE, struct.pack("<BBii", _CMD_MOVE, self._index, offset, speed))
-            self._execute_command()
+            _check_range("offset", offset, _I32_MIN, _I32_MAX)
+            _check_range("speed", speed, _I32_MIN, _I32_MAX)
+            frame = self._frame(_CMD_MOVE)
+            _encode_i32(frame, _COMMAND_PARAM_OFFSET, offset)
+            _encode_i32(frame, _COMMAND_PARAM_OFFSET + 4, speed)
+            self._execute_command(frame)
+            self._target = None
+            self._target_speed = speed
 
         @property
         def state(self):
-            mem_addr = _MEM_ADDR_STATE + self._index * _MOTOR_STATE_OFFSET
-            self._i2c.writeto_mem(self._i2c_address, mem_addr, b"\x00")
-            return self._i2c.readfrom_mem(self._i2c_address, mem_addr, 1)[0]
+            state = self._latch_read(_MEM_ADDR_STATE + self._mem_offset, self._buffer1, _STAT_STATE)[0]
+            self._observe_state(state)
+            return state
 
         @property
         def speed(self):
-            mem_addr = _MEM_ADDR_SPEED + self._index * _MOTOR_STATE_OFFSET
-            self._i2c.writeto_mem(self._i2c_address, mem_addr, b"\x00")
-            return struct.unpack("<i", self._i2c.readfrom_mem(self._i2c_address, mem_addr, 4))[0]
+            return _decode_i32(self._latch_read(_MEM_ADDR_SPEED + self._mem_offset, self._buffer4, _STAT_SPEED), 0)
 
         @property
         def position(self):
-            mem_addr = _MEM_ADDR_POSITION + self._index * _MOTOR_STATE_OFFSET
-            self._i2c.writeto_mem(self._i2c_address, mem_addr, b"\x00")
-            return struct.unpack("<i", self._i2c.readfrom_mem(self._i2c_address, mem_addr, 4))[0]
+            return _decode_i32(self._latch_read(_MEM_ADDR_POSITION + self._mem_offset, self._buffer4, _STAT_POSITION), 0)
 
         @property
         def pulse_count(self):
-            mem_addr = _MEM_ADDR_PULSE_COUNT + self._index * _MOTOR_STATE_OFFSET
-            self._i2c.writeto_mem(self._i2c_address, mem_addr, b"\x00")
-            return struct.unpack("<i", self._i2c.readfrom_mem(self._i2c_address, mem_addr, 4))[0]
+            return _decode_i32(self._latch_read(_MEM_ADDR_PULSE_COUNT + self._mem_offset, self._buffer4, _STAT_PULSE_COUNT), 0)
 
         @property
         def pwm_duty(self):
-            mem_addr = _MEM_ADDR_PWM_DUTY + self._index * _MOTOR_STATE_OFFSET
-            self._i2c.writeto_mem(self._i2c_address, mem_addr, b"\x00")
-            return struct.unpack("<h", self._i2c.readfrom_mem(self._i2c_address, mem_addr, 2))[0]
-
-    def __init__(self, i2c, i2c_address=DEFAULT_I2C_ADDRESS):
+            return _decode_i16(self._latch_read(_MEM_ADDR_PWM_DUTY + self._mem_offset, self._buffer2, _STAT_PWM_DUTY), 0)
+
+        def _read_state(self):
+            state_buffer = self._latch_read(_MEM_ADDR_STATE + self._mem_offset, self._state_buffer, _STAT_SNAPSHOT)
+            self._observe_state(state_buffer[0])
+            return state_buffer
+
+        def _poll_state(self):
+            if self._shadow is not None:
+                self._shadow.invalidate()
+            return self._read_state()
+
+        def snapshot(self):
+            return Snapshot(*struct.unpack_from(_SNAPSHOT_FORMAT, self._read_state()))
+
+        def wait_until_reached(self, timeout_ms=10000):
+            return _wait_until_reached((self,), (0,), self._poll_state, timeout_ms)
+
+    def __init__(
+        self,
+        i2c,
+        i2c_address=DEFAULT_I2C_ADDRESS,
+        suppress_redundant=False,
+        reset=True,
+        lazy=False,
+        max_age_ms=None,
+        arbiter=None,
+        stats=False,
+    ):
+        if getattr(arbiter, "asynchronous", False):
+            raise TypeError("Md20 cannot claim an AsyncArbiter; use AsyncMd20 or a LockArbiter")
+        self._stats = None
+        if stats:
+            i2c = _CountingI2C(i2c)
+            self._stats = Md20.Stats(i2c)
         self._i2c = i2c
         self._i2c_address = i2c_address
-        self._motors = []
-        for i in range(MOTOR_NUM):
-            self._motors.append(Md20.Motor(i, i2c, i2c_address))
+        self._latch_readfrom_mem_into = _latch_reader(i2c)
+        self._buffer1 = bytearray(1)
+        self._state_buffer = bytearray(_MOTOR_STATE_OFFSET * MOTOR_NUM)
+        self._suppress_redundant = suppress_redundant
+        self._reset = reset
+        self._motors = [None] * MOTOR_NUM
+        self._batch_sink = None
+        self._arbiter = arbiter
+        self._shadow = None if max_age_ms is None else Md20.Shadow(i2c, i2c_address, max_age_ms, self._motors, arbiter)
+        if not lazy:
+            for i in range(MOTOR_NUM):
+                self._motors[i] = Md20.Motor(i, i2c, i2c_address, suppress_redundant, False, self._shadow, arbiter, self._stats)
+            if reset:
+                with self.batch():
+                    for motor in self._motors:
+                        motor.reset()
 
     def __getitem__(self, index):
-        return self._motors[index]
+        motor = self._motors[index]
+        if motor is None:
+            index %= MOTOR_NUM
+            sink = self._batch_sink
+            reset = self._reset and sink is None
+            motor = Md20.Motor(index, self._i2c, self._i2c_address, self._suppress_redundant, reset, self._shadow, self._arbiter, self._stats)
+            self._motors[index] = motor
+            if sink is not None:
+                motor._sink = sink
+                if self._reset:
+                    motor.reset()
+        return motor
+
+    def _attach_sink(self, sink):
+        self._batch_sink = sink
+        for motor in self._motors:
+            if motor is not None:
+                motor._sink = sink
+
+    def _detach_sink(self, invalidate):
+        self._batch_sink = None
+        for motor in self._motors:
+            if motor is not None:
+                motor._sink = None
+                if invalidate:
+                    motor._invalidate()
+
+    def _wait_command_emptied(self):
+        _wait_command_emptied(self._i2c, self._i2c_address, self._buffer1)
+
+    def _submit(self, frames):
+        stats = self._stats
+        with _claim(self._arbiter, _command_priority(frames)):
+            if stats is not None:
+                stats.begin()
+                stats.begin(_STAT_SLOT_FRAME)
+            self._wait_command_emptied()
+            start = ticks_us()
+            for i in range(len(frames)):
+                if stats is not None and i:
+                    stats.begin(_STAT_SLOT_FRAME)
+                self._i2c.writeto_mem(self._i2c_address, _MEM_ADDR_COMMAND_TYPE, frames[i])
+                last = ticks_us()
+                self._wait_command_emptied()
+                if stats is not None:
+                    stats.end(frames[i][0], _STAT_SLOT_FRAME)
+            if stats is not None:
+                stats.end(_STAT_BATCH)
+        if self._shadow is not None:
+            self._shadow.invalidate()
+        return ticks_diff(last, start), ticks_diff(ticks_us(), start)
+
+    def batch(self):
+        return Md20.Batch(self)
+
+    def stop_all(self):
+        with self.batch() as batch:
+            for index in range(MOTOR_NUM):
+                self[index].stop()
+        return batch
+
+    def run_speed_all(self, rpms):
+        with self.batch() as batch:
+            for index, rpm in enumerate(rpms):
+                self[index].run_speed(rpm)
+        return batch
+
+    def run_pwm_duty_all(self, pwm_duties):
+        with self.batch() as batch:
+            for index, pwm_duty in enumerate(pwm_duties):
+                self[index].run_pwm_duty(pwm_duty)
+        return batch
+
+    def _read_state_block(self):
+        stats = self._stats
+        with _claim(self._arbiter, PRIORITY_TELEMETRY):
+            if stats is not None:
+                stats.begin()
+            if self._shadow is not None:
+                self._shadow._refresh()
+                state_buffer = self._shadow.state
+            else:
+                state_buffer = self._state_buffer
+                self._latch_readfrom_mem_into(self._i2c_address, _MEM_ADDR_STATE, _MEM_ADDR_STATE, state_buffer)
+            if stats is not None:
+                stats.end(_STAT_STATE_BLOCK)
+        if self._shadow is None:
+            for motor in self._motors:
+                if motor is not None:
+                    motor._observe_state(state_buffer[motor._mem_offset])
+        return state_buffer
+
+    def wait_all_reached(self, indices=None, timeout_ms=10000):
+        if indices is None:
+            indices = range(MOTOR_NUM)
+        motors = [self[index] for index in indices]
+        offsets = [motor._mem_offset for motor in motors]
+        return _wait_until_reached(motors, offsets, self._read_state_block, timeout_ms)
+
+    def move_to_all(self, targets, max_speed, timeout_ms=10000):
+        state_buffer = self._read_state_block()
+        distances = [
+            abs(target - _decode_i32(state_buffer, index * _MOTOR_STATE_OFFSET + _MEM_ADDR_POSITION - _MEM_ADDR_STATE))
+            for index, target in enumerate(targets)
+        ]
+        longest = max(distances) or 1
+        with self.batch() as batch:
+            for index, target in enumerate(targets):
+                self[index].move_to(target, max(1, max_speed * distances[index] // longest))
+        if timeout_ms is None:
+            return MoveReport(None, 0, batch.skew_us, None)
+        motors = [self[index] for index in range(len(targets))]
+        offsets = [motor._mem_offset for motor in motors]
+        arrivals = [None] * len(motors)
+        result, polls = _wait_until_reached(motors, offsets, self._read_state_block, timeout_ms, arrivals)
+        if result != WAIT_REACHED:
+            return MoveReport(result, polls, batch.skew_us, None)
+        arrivals = [arrival for index, arrival in enumerate(arrivals) if distances[index]]
+        arrival_skew_us = max(arrivals) - min(arrivals) if arrivals else 0
+        return MoveReport(result, polls, batch.skew_us, arrival_skew_us)
+
+    def _cached_state_block(self):
+        if self._shadow is None:
+            return self._read_state_block()
+        self._shadow.load()
+        return self._shadow.state
+
+    def snapshot_all(self):
+        state_buffer = self._cached_state_block()
+        return tuple(Snapshot(*struct.unpack_from(_SNAPSHOT_FORMAT, state_buffer, index * _MOTOR_STATE_OFFSET)) for index in range(MOTOR_NUM))
+
+    @property
+    def suppressed_commands(self):
+        return sum(motor.suppressed_commands for motor in self._motors if motor is not None)
+
+    @property
+    def shadow(self):
+        return self._shadow
+
+    @property
+    def arbiter(self):
+        return self._arbiter
+
+    def stats(self):
+        return None if self._stats is None else self._stats.report()
+
+    def reset_stats(self):
+        if self._stats is not None:
+            self._stats.reset()
+
+    def _identity(self, mem_addr, size):
+        stats = self._stats
+        with _claim(self._arbiter, PRIORITY_TELEMETRY):
+            if stats is not None:
+                stats.begin()
+            if self._shadow is None:
+                data = self._i2c.readfrom_mem(self._i2c_address, mem_addr, size)
+            else:
+                data = bytes(self._shadow._load()[mem_addr : mem_addr + size])
+            if stats is not None:
+                stats.end(_STAT_IDENTITY)
+        return data
 
     @property
     def firmware_version(self):
-        version = self._i2c.readfrom_mem(self._i2c_address, _MEM_ADDR_MAJOR_VERSION, 3)
+        version = self._identity(_MEM_ADDR_MAJOR_VERSION, 3)
         return f"{version[0]}.{version[1]}.{version[2]}"
 
     @property
     def device_id(self):
-        return self._i2c.readfrom_mem(self._i2c_address, _MEM_ADDR_DEVICE_ID, 1)[0]
+        return self._identity(_MEM_ADDR_DEVICE_ID, 1)[0]
 
     @property
     def name(self):
-        return self._i2c.readfrom_mem(self._i2c_address, _MEM_ADDR_NAME, 8).decode("utf-8")
+        return self._identity(_MEM_ADDR_NAME, 8).decode("utf-8")
@@ -0,0 +1,119 @@
+import asyncio
+from md20 import PRIORITY_NUM, sleep_ms, ticks_diff, ticks_us
+
+
+class Arbiter:
+
+    class Claim:
+
+        def __init__(self, arbiter, priority):
+            self._arbiter = arbiter
+            self._priority = priority
+
+        def __enter__(self):
+            self._arbiter.acquire(self._priority)
+            return self
+
+        def __exit__(self, exc_type, exc_value, traceback):
+            self._arbiter.release()
+
+        async def __aenter__(self):
+            await self._arbiter.acquire(self._priority)
+            return self
+
+        async def __aexit__(self, exc_type, exc_value, traceback):
+            self._arbiter.release()
+
+    asynchronous = False
+
+    def __init__(self):
+        self._owned = False
+        self._waiting = [0] * PRIORITY_NUM
+        self.claims = tuple(Arbiter.Claim(self, priority) for priority in range(PRIORITY_NUM))
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.waits = [0] * PRIORITY_NUM
+        self.wait_total_us = [0] * PRIORITY_NUM
+        self.wait_max_us = [0] * PRIORITY_NUM
+
+    def average_wait_us(self, priority):
+        waits = self.waits[priority]
+        return self.wait_total_us[priority] // waits if waits else 0
+
+    def _blocked(self, priority):
+        if self._owned:
+            return True
+        for higher in range(priority):
+            if self._waiting[higher]:
+                return True
+        return False
+
+    def _record(self, priority, start):
+        wait_us = ticks_diff(ticks_us(), start)
+        self.waits[priority] += 1
+        self.wait_total_us[priority] += wait_us
+        if wait_us > self.wait_max_us[priority]:
+            self.wait_max_us[priority] = wait_us
+
+
+class LockArbiter(Arbiter):
+
+    def __init__(self):
+        import _thread
+
+        super().__init__()
+        self._lock = _thread.allocate_lock()
+
+    def acquire(self, priority):
+        start = ticks_us()
+        lock = self._lock
+        lock.acquire()
+        try:
+            if self._blocked(priority):
+                self._waiting[priority] += 1
+                try:
+                    while self._blocked(priority):
+                        lock.release()
+                        try:
+                            sleep_ms(0)
+                        finally:
+                            lock.acquire()
+                finally:
+                    self._waiting[priority] -= 1
+            self._owned = True
+            self._record(priority, start)
+        finally:
+            lock.release()
+
+    def release(self):
+        self._owned = False
+
+
+class AsyncArbiter(Arbiter):
+
+    asynchronous = True
+
+    def __init__(self):
+        super().__init__()
+        self._released = asyncio.Event()
+
+    async def acquire(self, priority):
+        start = ticks_us()
+        if self._blocked(priority):
+            self._waiting[priority] += 1
+            try:
+                while self._blocked(priority):
+                    self._released.clear()
+                    await self._released.wait()
+            except BaseException:
+                self._released.set()
+                raise
+            finally:
+                self._waiting[priority] -= 1
+        self._owned = True
+        self._record(priority, start)
+
+    def release(self):
+        self._owned = False
+        self._released.set()
@@ -0,0 +1,210 @@
+import asyncio
+import md20
+from md20 import MEM_ADDR_COMMAND_EXECUTE, MEM_ADDR_COMMAND_TYPE, PRIORITY_COMMAND, PRIORITY_TELEMETRY, PRIORITY_URGENT, ticks_diff, ticks_ms
+from md20_arbiter import AsyncArbiter
+
+
+class AsyncMd20:
+
+    class AsyncMotor:
+
+        def __init__(self, board, motor):
+            self._board = board
+            self._motor = motor
+            self._frame = None
+            motor._sink = self._capture
+
+        def _capture(self, frame):
+            self._frame = frame
+
+        async def _execute_command(self):
+            frame = self._frame
+            if frame is None:
+                return
+            self._frame = None
+            board = self._board
+            start = ticks_ms()
+            try:
+                await board._wait_command_emptied(start)
+                board._i2c.writeto_mem(board._i2c_address, MEM_ADDR_COMMAND_TYPE, frame)
+                await board._wait_command_emptied(start)
+            except BaseException:
+                self._motor._invalidate()
+                raise
+
+        async def reset(self):
+            async with self._board._arbiter.claims[PRIORITY_COMMAND]:
+                self._motor.reset()
+                await self._execute_command()
+
+        async def setup_encoder_mode(self, ppr, reduction_ration, phase_relation):
+            async with self._board._arbiter.claims[PRIORITY_COMMAND]:
+                self._motor.setup_encoder_mode(ppr, reduction_ration, phase_relation)
+                await self._execute_command()
+
+        async def setup_dc_mode(self):
+            async with self._board._arbiter.claims[PRIORITY_COMMAND]:
+                self._motor.setup_dc_mode()
+                await self._execute_command()
+
+        async def set_speed_pid(self, p, i, d):
+            async with self._board._arbiter.claims[PRIORITY_COMMAND]:
+                self._motor.speed_pid_p = p
+                await self._execute_command()
+                self._motor.speed_pid_i = i
+                await self._execute_command()
+                self._motor.speed_pid_d = d
+                await self._execute_command()
+
+        async def set_position_pid(self, p, i, d):
+            async with self._board._arbiter.claims[PRIORITY_COMMAND]:
+                self._motor.position_pid_p = p
+                await self._execute_command()
+                self._motor.position_pid_i = i
+                await self._execute_command()
+                self._motor.position_pid_d = d
+                await self._execute_command()
+
+        async def set_current_position(self, position):
+            async with self._board._arbiter.claims[PRIORITY_COMMAND]:
+                self._motor.set_current_position(position)
+                await self._execute_command()
+
+        async def set_pulse_count(self, pulse_count):
+            async with self._board._arbiter.claims[PRIORITY_COMMAND]:
+                self._motor.set_pulse_count(pulse_count)
+                await self._execute_command()
+
+        async def stop(self):
+            async with self._board._arbiter.claims[PRIORITY_URGENT]:
+                self._motor.stop()
+                await self._execute_command()
+
+        async def run_speed(self, rpm):
+            async with self._board._arbiter.claims[PRIORITY_COMMAND]:
+                self._motor.run_speed(rpm)
+                await self._execute_command()
+
+        async def run_pwm_duty(self, pwm_duty):
+            async with self._board._arbiter.claims[PRIORITY_COMMAND]:
+                self._motor.run_pwm_duty(pwm_duty)
+                await self._execute_command()
+
+        async def move_to(self, position, speed):
+            async with self._board._arbiter.claims[PRIORITY_COMMAND]:
+                self._motor.move_to(position, speed)
+                await self._execute_command()
+
+        async def move(self, offset, speed):
+            async with self._board._arbiter.claims[PRIORITY_COMMAND]:
+                self._motor.move(offset, speed)
+                await self._execute_command()
+
+        async def snapshot(self):
+            async with self._board._arbiter.claims[PRIORITY_TELEMETRY]:
+                return self._motor.snapshot()
+
+        @property
+        def speed_pid_p(self):
+            return self._motor.speed_pid_p
+
+        @property
+        def speed_pid_i(self):
+            return self._motor.speed_pid_i
+
+        @property
+        def speed_pid_d(self):
+            return self._motor.speed_pid_d
+
+        @property
+        def position_pid_p(self):
+            return self._motor.position_pid_p
+
+        @property
+        def position_pid_i(self):
+            return self._motor.position_pid_i
+
+        @property
+        def position_pid_d(self):
+            return self._motor.position_pid_d
+
+        @property
+        def state(self):
+            return self._motor.state
+
+        @property
+        def speed(self):
+            return self._motor.speed
+
+        @property
+        def position(self):
+            return self._motor.position
+
+        @property
+        def pulse_count(self):
+            return self._motor.pulse_count
+
+        @property
+        def pwm_duty(self):
+            return self._motor.pwm_duty
+
+    def __init__(
+        self,
+        i2c,
+        i2c_address=md20.DEFAULT_I2C_ADDRESS,
+        poll_interval_ms=1,
+        max_poll_interval_ms=16,
+        timeout_ms=1000,
+        arbiter=None,
+    ):
+        self._i2c = i2c
+        self._i2c_address = i2c_address
+        self._board = md20.Md20(i2c, i2c_address, reset=False)
+        self._buffer = bytearray(1)
+        self._arbiter = AsyncArbiter() if arbiter is None else arbiter
+        self.poll_interval_ms = poll_interval_ms
+        self.max_poll_interval_ms = max_poll_interval_ms
+        self.timeout_ms = timeout_ms
+        self._motors = []
+        for i in range(md20.MOTOR_NUM):
+            self._motors.append(AsyncMd20.AsyncMotor(self, self._board[i]))
+
+    def __getitem__(self, index):
+        return self._motors[index]
+
+    async def reset(self):
+        async with self._arbiter.claims[PRIORITY_COMMAND]:
+            for motor in self._motors:
+                motor._motor.reset()
+                await motor._execute_command()
+
+    async def _wait_command_emptied(self, start):
+        buffer = self._buffer
+        interval = self.poll_interval_ms
+        self._i2c.readfrom_mem_into(self._i2c_address, MEM_ADDR_COMMAND_EXECUTE, buffer)
+        while buffer[0] != 0:
+            if ticks_diff(ticks_ms(), start) >= self.timeout_ms:
+                raise asyncio.TimeoutError()
+            await asyncio.sleep(interval / 1000)
+            interval = min(interval * 2, self.max_poll_interval_ms)
+            self._i2c.readfrom_mem_into(self._i2c_address, MEM_ADDR_COMMAND_EXECUTE, buffer)
+
+    async def snapshot_all(self):
+        async with self._arbiter.claims[PRIORITY_TELEMETRY]:
+            return self._board.snapshot_all()
+
+    @property
+    def arbiter(self):
+        return self._arbiter
+
+    @property
+    def firmware_version(self):
+        return self._board.firmware_version
+
+    @property
+    def device_id(self):
+        return self._board.device_id
+
+    @property
+    def name(self):
+        return self._board.name
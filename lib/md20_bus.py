@@ -0,0 +1,103 @@
+import md20
+from md20 import MEM_ADDR_COMMAND_EXECUTE, MEM_ADDR_COMMAND_TYPE, ticks_diff, ticks_us
+
+
+class Md20Bus:
+
+    class Batch:
+
+        def __init__(self, bus):
+            self._bus = bus
+            self._queues = [[] for _ in bus._boards]
+            self.skew_us = 0
+            self.elapsed_us = 0
+
+        def __enter__(self):
+            for board, queue in zip(self._bus._boards, self._queues):
+                board._attach_sink(Md20Bus.Batch._sink(queue))
+            return self
+
+        def __exit__(self, exc_type, exc_value, traceback):
+            queues = self._queues
+            self._queues = [[] for _ in self._bus._boards]
+            submitted = exc_type is None
+            try:
+                if submitted:
+                    submitted = False
+                    self.skew_us, self.elapsed_us = self._bus._submit(queues)
+                    submitted = True
+            finally:
+                for board in self._bus._boards:
+                    board._detach_sink(not submitted)
+
+        @staticmethod
+        def _sink(queue):
+            def append(frame):
+                queue.append(bytes(frame))
+
+            return append
+
+    def __init__(self, i2c, i2c_addresses, suppress_redundant=False, reset=True):
+        self._i2c = i2c
+        self._buffer = bytearray(1)
+        self._boards = [md20.Md20(i2c, i2c_address, suppress_redundant, reset=False) for i2c_address in i2c_addresses]
+        if reset:
+            with self.batch():
+                for board in self._boards:
+                    for index in range(md20.MOTOR_NUM):
+                        board[index].reset()
+
+    def __getitem__(self, index):
+        return self._boards[index]
+
+    def __len__(self):
+        return len(self._boards)
+
+    def _submit(self, queues):
+        buffer = self._buffer
+        positions = [0] * len(queues)
+        active = [index for index, queue in enumerate(queues) if queue]
+        start = last = ticks_us()
+        first = True
+        while active:
+            for index in tuple(active):
+                i2c_address = self._boards[index]._i2c_address
+                self._i2c.readfrom_mem_into(i2c_address, MEM_ADDR_COMMAND_EXECUTE, buffer)
+                if buffer[0] != 0:
+                    continue
+                queue = queues[index]
+                if positions[index] == len(queue):
+                    active.remove(index)
+                    continue
+                self._i2c.writeto_mem(i2c_address, MEM_ADDR_COMMAND_TYPE, queue[positions[index]])
+                positions[index] += 1
+                last = ticks_us()
+                if first:
+                    start = last
+                    first = False
+        return ticks_diff(last, start), ticks_diff(ticks_us(), start)
+
+    def batch(self):
+        return Md20Bus.Batch(self)
+
+    def stop_all(self):
+        with self.batch() as batch:
+            for board in self._boards:
+                for index in range(md20.MOTOR_NUM):
+                    board[index].stop()
+        return batch
+
+    def run_speed_all(self, rpms):
+        with self.batch() as batch:
+            for index, rpm in enumerate(rpms):
+                self._boards[index // md20.MOTOR_NUM][index % md20.MOTOR_NUM].run_speed(rpm)
+        return batch
+
+    def run_pwm_duty_all(self, pwm_duties):
+        with self.batch() as batch:
+            for index, pwm_duty in enumerate(pwm_duties):
+                self._boards[index // md20.MOTOR_NUM][index % md20.MOTOR_NUM].run_pwm_duty(pwm_duty)
+        return batch
+
+    def snapshot_all(self):
+        return tuple(board.snapshot_all() for board in self._boards)
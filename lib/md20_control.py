@@ -0,0 +1,139 @@
+from array import array
+import md20
+from md20 import (
+    STATE_BLOCK_POSITION,
+    STATE_BLOCK_PULSE_COUNT,
+    STATE_BLOCK_PWM_DUTY,
+    STATE_BLOCK_SPEED,
+    STATE_BLOCK_STRIDE,
+    _decode_i16,
+    _decode_i32,
+    const,
+    sleep_ms,
+    sleep_us,
+    ticks_add,
+    ticks_diff,
+    ticks_us,
+)
+from md20_telemetry import FIELD_NUM, FIELD_POSITION, FIELD_PULSE_COUNT, FIELD_PWM_DUTY, FIELD_SPEED, FIELD_STATE
+
+COMMAND_PWM_DUTY: int = const(0)
+COMMAND_SPEED: int = const(1)
+
+_SPIN_US: int = const(1500)
+
+
+class ControlLoop:
+
+    def __init__(self, md20_obj, step, period_us=10000, command=COMMAND_PWM_DUTY):
+        self._md20 = md20_obj
+        self._step = step
+        self.period_us = period_us
+        self.command = command
+        self.feedback = [array("i", bytes(4 * FIELD_NUM)) for _ in range(md20.MOTOR_NUM)]
+        self._running = False
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.iterations = 0
+        self.overruns = 0
+        self.min_jitter_us = 0
+        self.max_jitter_us = 0
+        self.total_jitter_us = 0
+        self.min_step_us = 0
+        self.max_step_us = 0
+        self.total_step_us = 0
+        self.min_cycle_us = 0
+        self.max_cycle_us = 0
+        self.total_cycle_us = 0
+
+    @property
+    def avg_jitter_us(self):
+        return self.total_jitter_us // self.iterations if self.iterations else 0
+
+    @property
+    def avg_step_us(self):
+        return self.total_step_us // self.iterations if self.iterations else 0
+
+    @property
+    def avg_cycle_us(self):
+        return self.total_cycle_us // self.iterations if self.iterations else 0
+
+    @property
+    def sustainable_rate_hz(self):
+        cycle_us = self.avg_cycle_us
+        return 1000000 // cycle_us if cycle_us else 0
+
+    def _read_feedback(self):
+        state_buffer = self._md20._read_state_block()
+        for index in range(md20.MOTOR_NUM):
+            mem_offset = index * STATE_BLOCK_STRIDE
+            feedback = self.feedback[index]
+            feedback[FIELD_STATE] = state_buffer[mem_offset]
+            feedback[FIELD_SPEED] = _decode_i32(state_buffer, mem_offset + STATE_BLOCK_SPEED)
+            feedback[FIELD_POSITION] = _decode_i32(state_buffer, mem_offset + STATE_BLOCK_POSITION)
+            feedback[FIELD_PULSE_COUNT] = _decode_i32(state_buffer, mem_offset + STATE_BLOCK_PULSE_COUNT)
+            feedback[FIELD_PWM_DUTY] = _decode_i16(state_buffer, mem_offset + STATE_BLOCK_PWM_DUTY)
+
+    def _apply(self, commands):
+        with self._md20.batch():
+            for index, value in enumerate(commands):
+                if value is None:
+                    continue
+                if self.command == COMMAND_SPEED:
+                    self._md20[index].run_speed(value)
+                else:
+                    self._md20[index].run_pwm_duty(value)
+
+    def _wait(self, deadline):
+        remaining = ticks_diff(deadline, ticks_us())
+        if remaining > _SPIN_US:
+            sleep_ms((remaining - _SPIN_US) // 1000)
+            remaining = ticks_diff(deadline, ticks_us())
+        if remaining > 0:
+            sleep_us(remaining)
+
+    def _record(self, jitter_us, step_us, cycle_us):
+        if self.iterations == 0:
+            self.min_jitter_us = jitter_us
+            self.min_step_us = step_us
+            self.min_cycle_us = cycle_us
+        self.iterations += 1
+        self.total_jitter_us += jitter_us
+        self.min_jitter_us = min(self.min_jitter_us, jitter_us)
+        self.max_jitter_us = max(self.max_jitter_us, jitter_us)
+        self.total_step_us += step_us
+        self.min_step_us = min(self.min_step_us, step_us)
+        self.max_step_us = max(self.max_step_us, step_us)
+        self.total_cycle_us += cycle_us
+        self.min_cycle_us = min(self.min_cycle_us, cycle_us)
+        self.max_cycle_us = max(self.max_cycle_us, cycle_us)
+
+    def stop(self):
+        self._running = False
+
+    def run(self, iterations=None):
+        period_us = self.period_us
+        self._running = True
+        deadline = ticks_us()
+        last = deadline
+        count = 0
+        while self._running and (iterations is None or count < iterations):
+            self._wait(deadline)
+            start = ticks_us()
+            interval_us = ticks_diff(start, last)
+            last = start
+            self._read_feedback()
+            step_start = ticks_us()
+            commands = self._step(self.feedback, interval_us)
+            step_us = ticks_diff(ticks_us(), step_start)
+            if commands is not None:
+                self._apply(commands)
+            end = ticks_us()
+            self._record(abs(ticks_diff(start, deadline)), step_us, ticks_diff(end, start))
+            deadline = ticks_add(deadline, period_us)
+            while ticks_diff(end, deadline) >= 0:
+                deadline = ticks_add(deadline, period_us)
+                self.overruns += 1
+            count += 1
+        self._running = False
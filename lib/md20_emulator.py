@@ -0,0 +1,257 @@
+import struct
+import md20
+from md20 import (
+    _CMD_MOVE,
+    _CMD_MOVE_TO,
+    _CMD_RESET,
+    _CMD_RUN_PWM_DUTY,
+    _CMD_RUN_SPEED,
+    _CMD_SET_POSITION,
+    _CMD_SET_POSITION_PID_D,
+    _CMD_SET_POSITION_PID_I,
+    _CMD_SET_POSITION_PID_P,
+    _CMD_SET_PULSE_COUNT,
+    _CMD_SET_SPEED_PID_D,
+    _CMD_SET_SPEED_PID_I,
+    _CMD_SET_SPEED_PID_P,
+    _CMD_SETUP,
+    _CMD_STOP,
+    _MEM_ADDR_COMMAND_EXECUTE,
+    _MEM_ADDR_COMMAND_PARAM,
+    _MEM_ADDR_COMMAND_TYPE,
+    _MEM_ADDR_DEVICE_ID,
+    _MEM_ADDR_MAJOR_VERSION,
+    _MEM_ADDR_NAME,
+    _MEM_ADDR_PULSE_COUNT,
+    _MEM_ADDR_PWM_DUTY,
+    _MEM_ADDR_POSITION,
+    _MEM_ADDR_SPEED,
+    _MEM_ADDR_SPEED_P,
+    _MEM_ADDR_STATE,
+    _MOTOR_STATE_OFFSET,
+    const,
+)
+
+MEM_SIZE: int = const(_MEM_ADDR_STATE + _MOTOR_STATE_OFFSET * md20.MOTOR_NUM)
+
+MAX_PWM_DUTY: int = const(1023)
+
+_DEFAULT_GAINS = (150, 150, 100, 1000, 100, 100)
+
+_PID_COMMANDS = (
+    _CMD_SET_SPEED_PID_P,
+    _CMD_SET_SPEED_PID_I,
+    _CMD_SET_SPEED_PID_D,
+    _CMD_SET_POSITION_PID_P,
+    _CMD_SET_POSITION_PID_I,
+    _CMD_SET_POSITION_PID_D,
+)
+
+
+class Md20Emulator:
+
+    class Motor:
+
+        def __init__(self, max_rpm):
+            self.max_rpm = max_rpm
+            self.reset()
+
+        def reset(self):
+            self.state = md20.STATE_IDLE
+            self.ppr = 0
+            self.reduction_ratio = 0
+            self.speed = 0
+            self.position = 0.0
+            self.target = 0
+            self.pulse_offset = 0
+            self.pwm_duty = 0
+            self.gains = list(_DEFAULT_GAINS)
+
+        @property
+        def pulse_count(self):
+            return int(self.position * self.ppr * self.reduction_ratio / 360) + self.pulse_offset
+
+        def run(self, rpm):
+            rpm = max(-self.max_rpm, min(self.max_rpm, rpm))
+            self.speed = rpm
+            self.pwm_duty = rpm * MAX_PWM_DUTY // self.max_rpm
+
+        def advance(self, elapsed_us):
+            if self.speed == 0:
+                return
+            step = self.speed * 6 * elapsed_us / 1000000
+            if self.state == md20.STATE_RUNNING_TO_POSITION:
+                remaining = self.target - self.position
+                if abs(step) >= abs(remaining):
+                    self.position = float(self.target)
+                    self.state = md20.STATE_REACHED_POSITION
+                    self.run(0)
+                    return
+            self.position += step
+
+    def __init__(self, i2c_address=md20.DEFAULT_I2C_ADDRESS, freq=400000, command_latency_us=500, max_rpm=300, realtime=False):
+        self.i2c_address = i2c_address
+        self.realtime = realtime
+        self._wall_us = md20.ticks_us()
+        self.freq = freq
+        self.command_latency_us = command_latency_us
+        self.now_us = 0
+        self.mem = bytearray(MEM_SIZE)
+        self.mem[_MEM_ADDR_DEVICE_ID] = md20.DEFAULT_I2C_ADDRESS
+        self.mem[_MEM_ADDR_MAJOR_VERSION : _MEM_ADDR_MAJOR_VERSION + 3] = b"\x01\x00\x02"
+        self.mem[_MEM_ADDR_NAME : _MEM_ADDR_NAME + 8] = b"MD20EMU\x00"
+        self.motors = [Md20Emulator.Motor(max_rpm) for _ in range(md20.MOTOR_NUM)]
+        self._command_due_us = None
+        self.reset_counters()
+        self._publish_gains()
+
+    def reset_counters(self):
+        self.transactions = 0
+        self.bytes_transferred = 0
+        self.bus_time_us = 0
+        self.commands = 0
+
+    def _transfer(self, i2c_address, size, read):
+        if i2c_address != self.i2c_address:
+            raise OSError(19)
+        bits = 9 * (size + (3 if read else 2)) + (3 if read else 2)
+        elapsed_us = bits * 1000000 // self.freq
+        self.transactions += 1
+        self.bytes_transferred += size
+        self.bus_time_us += elapsed_us
+        if self.realtime:
+            wall_us = md20.ticks_us()
+            elapsed_us = max(elapsed_us, md20.ticks_diff(wall_us, self._wall_us))
+            self._wall_us = wall_us
+        self.advance(elapsed_us)
+
+    def advance(self, elapsed_us):
+        self.now_us += elapsed_us
+        for motor in self.motors:
+            motor.advance(elapsed_us)
+        if self._command_due_us is not None and self.now_us >= self._command_due_us:
+            self._command_due_us = None
+            self._execute(self.mem[_MEM_ADDR_COMMAND_TYPE], self.mem[_MEM_ADDR_COMMAND_TYPE + 1])
+            self.mem[_MEM_ADDR_COMMAND_EXECUTE] = 0
+
+    def writeto_mem(self, i2c_address, mem_addr, buffer):
+        self._transfer(i2c_address, len(buffer), False)
+        if mem_addr >= _MEM_ADDR_STATE:
+            self._latch()
+            return
+        self.mem[mem_addr : mem_addr + len(buffer)] = buffer
+        end = mem_addr + len(buffer)
+        if mem_addr <= _MEM_ADDR_COMMAND_EXECUTE < end and self.mem[_MEM_ADDR_COMMAND_EXECUTE] != 0:
+            self._command_due_us = self.now_us + self.command_latency_us
+
+    def readfrom_mem(self, i2c_address, mem_addr, size):
+        self._transfer(i2c_address, size, True)
+        return bytes(self.mem[mem_addr : mem_addr + size])
+
+    def readfrom_mem_into(self, i2c_address, mem_addr, buffer):
+        self._transfer(i2c_address, len(buffer), True)
+        buffer[:] = self.mem[mem_addr : mem_addr + len(buffer)]
+
+    def _latch(self):
+        for index, motor in enumerate(self.motors):
+            mem_offset = index * _MOTOR_STATE_OFFSET
+            self.mem[_MEM_ADDR_STATE + mem_offset] = motor.state
+            struct.pack_into("<i", self.mem, _MEM_ADDR_SPEED + mem_offset, motor.speed)
+            struct.pack_into("<i", self.mem, _MEM_ADDR_POSITION + mem_offset, int(motor.position))
+            struct.pack_into("<i", self.mem, _MEM_ADDR_PULSE_COUNT + mem_offset, motor.pulse_count)
+            struct.pack_into("<h", self.mem, _MEM_ADDR_PWM_DUTY + mem_offset, motor.pwm_duty)
+
+    def _publish_gains(self):
+        for index, motor in enumerate(self.motors):
+            struct.pack_into("<6H", self.mem, _MEM_ADDR_SPEED_P + index * _MOTOR_STATE_OFFSET, *motor.gains)
+
+    def _execute(self, command, index):
+        if index >= md20.MOTOR_NUM:
+            return
+        self.commands += 1
+        motor = self.motors[index]
+        param = _MEM_ADDR_COMMAND_PARAM
+        if command == _CMD_SETUP:
+            motor.ppr, motor.reduction_ratio = struct.unpack_from("<HH", self.mem, param)
+            motor.state = md20.STATE_IDLE
+            motor.run(0)
+        elif command == _CMD_RESET:
+            motor.reset()
+        elif command in _PID_COMMANDS:
+            motor.gains[_PID_COMMANDS.index(command)] = struct.unpack_from("<H", self.mem, param)[0]
+        elif command == _CMD_SET_POSITION:
+            motor.position = float(struct.unpack_from("<i", self.mem, param)[0])
+        elif command == _CMD_SET_PULSE_COUNT:
+            motor.pulse_offset = 0
+            motor.pulse_offset = struct.unpack_from("<i", self.mem, param)[0] - motor.pulse_count
+        elif command == _CMD_STOP:
+            motor.state = md20.STATE_IDLE
+            motor.run(0)
+        elif command == _CMD_RUN_PWM_DUTY:
+            pwm_duty = struct.unpack_from("<h", self.mem, param)[0]
+            motor.state = md20.STATE_RUNNING_WITH_PWM_DUTY
+            motor.run(pwm_duty * motor.max_rpm // MAX_PWM_DUTY)
+            motor.pwm_duty = pwm_duty
+        elif command == _CMD_RUN_SPEED:
+            motor.state = md20.STATE_RUNNING_WITH_SPEED
+            motor.run(struct.unpack_from("<i", self.mem, param)[0])
+        elif command in (_CMD_MOVE_TO, _CMD_MOVE):
+            target, speed = struct.unpack_from("<ii", self.mem, param)
+            if command == _CMD_MOVE:
+                target += int(motor.position)
+            motor.target = target
+            if target == int(motor.position):
+                motor.state = md20.STATE_REACHED_POSITION
+                motor.run(0)
+            else:
+                motor.state = md20.STATE_RUNNING_TO_POSITION
+                motor.run(abs(speed) if target > motor.position else -abs(speed))
+        self._publish_gains()
+
+
+class EmulatedBus:
+
+    def __init__(self, devices):
+        self.devices = {device.i2c_address: device for device in devices}
+        self.reset_counters()
+
+    def reset_counters(self):
+        self.transactions = 0
+        self.bytes_transferred = 0
+        self.bus_time_us = 0
+        for device in self.devices.values():
+            device.reset_counters()
+
+    def _device(self, i2c_address):
+        device = self.devices.get(i2c_address)
+        if device is None:
+            raise OSError(19)
+        return device
+
+    def _share(self, device, start_us, size):
+        elapsed_us = device.now_us - start_us
+        self.transactions += 1
+        self.bytes_transferred += size
+        self.bus_time_us += elapsed_us
+        for other in self.devices.values():
+            if other is not device:
+                other.advance(elapsed_us)
+
+    def writeto_mem(self, i2c_address, mem_addr, buffer):
+        device = self._device(i2c_address)
+        start_us = device.now_us
+        device.writeto_mem(i2c_address, mem_addr, buffer)
+        self._share(device, start_us, len(buffer))
+
+    def readfrom_mem(self, i2c_address, mem_addr, size):
+        device = self._device(i2c_address)
+        start_us = device.now_us
+        data = device.readfrom_mem(i2c_address, mem_addr, size)
+        self._share(device, start_us, size)
+        return data
+
+    def readfrom_mem_into(self, i2c_address, mem_addr, buffer):
+        device = self._device(i2c_address)
+        start_us = device.now_us
+        device.readfrom_mem_into(i2c_address, mem_addr, buffer)
+        self._share(device, start_us, len(buffer))
@@ -0,0 +1,120 @@
+import math
+from array import array
+from md20 import STATE_BLOCK_PULSE_COUNT, STATE_BLOCK_SPEED, STATE_BLOCK_STRIDE, _decode_i32
+
+_TWO_PI = 2 * math.pi
+
+
+class Drive:
+
+    def __init__(self, md20_obj, indices, signs, wheel_radius):
+        if len(indices) != len(signs):
+            raise ValueError("indices and signs must have the same length")
+        self._md20 = md20_obj
+        self._indices = tuple(indices)
+        self._signs = tuple(signs)
+        self.wheel_radius = wheel_radius
+        wheel_num = len(self._indices)
+        self._meters_per_count = array("f", [0.0] * wheel_num)
+        for i, index in enumerate(self._indices):
+            motor = md20_obj[index]
+            counts_per_revolution = motor.ppr * motor.reduction_ratio
+            if not counts_per_revolution:
+                raise ValueError(f"motor {index} is not in encoder mode")
+            self._meters_per_count[i] = self._signs[i] * _TWO_PI * wheel_radius / counts_per_revolution
+        self._rpm_per_meter_per_second = 60 / (_TWO_PI * wheel_radius)
+        self._counts = array("i", [0] * wheel_num)
+        self._distances = array("f", [0.0] * wheel_num)
+        self._speeds = array("f", [0.0] * wheel_num)
+        self._wheel_speeds = array("f", [0.0] * wheel_num)
+        self._body = array("f", [0.0] * 3)
+        self._primed = False
+        self.updates = 0
+        self.vx = 0.0
+        self.vy = 0.0
+        self.omega = 0.0
+        self.reset_pose()
+
+    def reset_pose(self, x=0.0, y=0.0, theta=0.0):
+        self.x = x
+        self.y = y
+        self.theta = theta
+
+    def update(self):
+        state_buffer = self._md20._read_state_block()
+        counts = self._counts
+        distances = self._distances
+        speeds = self._speeds
+        meters_per_count = self._meters_per_count
+        for i in range(len(counts)):
+            base = self._indices[i] * STATE_BLOCK_STRIDE
+            count = _decode_i32(state_buffer, base + STATE_BLOCK_PULSE_COUNT)
+            distances[i] = (count - counts[i]) * meters_per_count[i]
+            counts[i] = count
+            speeds[i] = self._signs[i] * _decode_i32(state_buffer, base + STATE_BLOCK_SPEED) / self._rpm_per_meter_per_second
+        body = self._body
+        self._forward(speeds, body)
+        self.vx = body[0]
+        self.vy = body[1]
+        self.omega = body[2]
+        if not self._primed:
+            self._primed = True
+            return
+        self._forward(distances, body)
+        heading = self.theta + body[2] / 2
+        cos_heading = math.cos(heading)
+        sin_heading = math.sin(heading)
+        self.x += body[0] * cos_heading - body[1] * sin_heading
+        self.y += body[0] * sin_heading + body[1] * cos_heading
+        theta = self.theta + body[2]
+        if theta > math.pi:
+            theta -= _TWO_PI
+        elif theta <= -math.pi:
+            theta += _TWO_PI
+        self.theta = theta
+        self.updates += 1
+
+    def drive(self, vx, vy=0.0, omega=0.0):
+        wheel_speeds = self._wheel_speeds
+        self._inverse(vx, vy, omega, wheel_speeds)
+        with self._md20.batch() as batch:
+            for i, index in enumerate(self._indices):
+                self._md20[index].run_speed(round(self._signs[i] * wheel_speeds[i] * self._rpm_per_meter_per_second))
+        return batch
+
+
+class DifferentialDrive(Drive):
+
+    def __init__(self, md20_obj, wheel_radius, track_width, left=0, right=1, signs=(1, 1)):
+        self.track_width = track_width
+        super().__init__(md20_obj, (left, right), signs, wheel_radius)
+
+    def _forward(self, wheels, body):
+        body[0] = (wheels[0] + wheels[1]) / 2
+        body[1] = 0.0
+        body[2] = (wheels[1] - wheels[0]) / self.track_width
+
+    def _inverse(self, vx, vy, omega, wheels):
+        turn = omega * self.track_width / 2
+        wheels[0] = vx - turn
+        wheels[1] = vx + turn
+
+
+class MecanumDrive(Drive):
+
+    def __init__(self, md20_obj, wheel_radius, wheel_base, track_width, indices=(0, 1, 2, 3), signs=(1, 1, 1, 1)):
+        self._lever = (wheel_base + track_width) / 2
+        super().__init__(md20_obj, indices, signs, wheel_radius)
+
+    def _forward(self, wheels, body):
+        front_left, front_right, rear_left, rear_right = wheels
+        body[0] = (front_left + front_right + rear_left + rear_right) / 4
+        body[1] = (-front_left + front_right + rear_left - rear_right) / 4
+        body[2] = (-front_left + front_right - rear_left + rear_right) / (4 * self._lever)
+
+    def _inverse(self, vx, vy, omega, wheels):
+        turn = omega * self._lever
+        wheels[0] = vx - vy - turn
+        wheels[1] = vx + vy + turn
+        wheels[2] = vx + vy - turn
+        wheels[3] = vx - vy + turn
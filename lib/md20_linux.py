@@ -0,0 +1,124 @@
+import ctypes
+import os
+
+I2C_RDWR: int = 0x0707
+I2C_M_RD: int = 0x0001
+
+_MAX_MESSAGES = 3
+_MAX_WRITE_SIZE = 64
+
+
+class _Message(ctypes.Structure):
+    _fields_ = (
+        ("addr", ctypes.c_uint16),
+        ("flags", ctypes.c_uint16),
+        ("len", ctypes.c_uint16),
+        ("buf", ctypes.c_void_p),
+    )
+
+
+class _Transfer(ctypes.Structure):
+    _fields_ = (
+        ("msgs", ctypes.POINTER(_Message)),
+        ("nmsgs", ctypes.c_uint32),
+    )
+
+
+class LinuxI2C:
+
+    def __init__(self, bus, ioctl=None):
+        if ioctl is None:
+            import fcntl
+
+            self._fd = os.open(f"/dev/i2c-{bus}", os.O_RDWR)
+            self._ioctl = fcntl.ioctl
+        else:
+            self._fd = -1
+            self._ioctl = ioctl
+        self._messages = (_Message * _MAX_MESSAGES)()
+        self._transfer = _Transfer(self._messages, 0)
+        self._latch = bytearray(2)
+        self._mem_addr = bytearray(1)
+        self._write = bytearray(1 + _MAX_WRITE_SIZE)
+        self._latch_address = ctypes.addressof((ctypes.c_char * len(self._latch)).from_buffer(self._latch))
+        self._mem_addr_address = ctypes.addressof((ctypes.c_char * 1).from_buffer(self._mem_addr))
+        self._write_address = ctypes.addressof((ctypes.c_char * len(self._write)).from_buffer(self._write))
+        self.transfers = 0
+
+    def _message(self, index, i2c_address, flags, size, address):
+        message = self._messages[index]
+        message.addr = i2c_address
+        message.flags = flags
+        message.len = size
+        message.buf = address
+
+    def _submit(self, count):
+        self._transfer.nmsgs = count
+        self._ioctl(self._fd, I2C_RDWR, self._transfer)
+        self.transfers += 1
+
+    def writeto_mem(self, i2c_address, mem_addr, buffer):
+        size = len(buffer)
+        if size > _MAX_WRITE_SIZE:
+            raise ValueError("write too long")
+        self._write[0] = mem_addr
+        self._write[1 : 1 + size] = buffer
+        self._message(0, i2c_address, 0, 1 + size, self._write_address)
+        self._submit(1)
+
+    def readfrom_mem_into(self, i2c_address, mem_addr, buffer):
+        target = (ctypes.c_char * len(buffer)).from_buffer(buffer)
+        self._mem_addr[0] = mem_addr
+        self._message(0, i2c_address, 0, 1, self._mem_addr_address)
+        self._message(1, i2c_address, I2C_M_RD, len(buffer), ctypes.addressof(target))
+        self._submit(2)
+
+    def readfrom_mem(self, i2c_address, mem_addr, size):
+        buffer = bytearray(size)
+        self.readfrom_mem_into(i2c_address, mem_addr, buffer)
+        return bytes(buffer)
+
+    def latch_readfrom_mem_into(self, i2c_address, latch_addr, mem_addr, buffer):
+        target = (ctypes.c_char * len(buffer)).from_buffer(buffer)
+        self._latch[0] = latch_addr
+        self._mem_addr[0] = mem_addr
+        self._message(0, i2c_address, 0, 2, self._latch_address)
+        self._message(1, i2c_address, 0, 1, self._mem_addr_address)
+        self._message(2, i2c_address, I2C_M_RD, len(buffer), ctypes.addressof(target))
+        self._submit(3)
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class EmulatedIoctl:
+
+    def __init__(self, i2c):
+        self._i2c = i2c
+
+    def __call__(self, fd, request, transfer):
+        if request != I2C_RDWR:
+            raise OSError(22)
+        messages = transfer.msgs
+        count = transfer.nmsgs
+        i = 0
+        while i < count:
+            message = messages[i]
+            data = ctypes.string_at(message.buf, message.len)
+            if i + 1 < count and messages[i + 1].flags & I2C_M_RD:
+                read = messages[i + 1]
+                target = (ctypes.c_char * read.len).from_address(read.buf)
+                self._i2c.readfrom_mem_into(message.addr, data[0], memoryview(target).cast("B"))
+                i += 2
+            else:
+                self._i2c.writeto_mem(message.addr, data[0], data[1:])
+                i += 1
+        return count
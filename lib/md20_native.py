@@ -0,0 +1,51 @@
+import micropython
+from micropython import const
+
+_MEM_ADDR_COMMAND_EXECUTE: int = const(0x23)
+
+
+@micropython.viper
+def decode_u16(buffer, offset: int) -> int:
+    p = ptr8(buffer)  # noqa: F821
+    return int(p[offset]) | int(p[offset + 1]) << 8
+
+
+@micropython.viper
+def decode_i16(buffer, offset: int) -> int:
+    p = ptr8(buffer)  # noqa: F821
+    top = int(p[offset + 1])
+    if top & 0x80:
+        top -= 0x100
+    return top << 8 | int(p[offset])
+
+
+@micropython.viper
+def decode_i32(buffer, offset: int) -> int:
+    p = ptr8(buffer)  # noqa: F821
+    top = int(p[offset + 3])
+    if top & 0x80:
+        top -= 0x100
+    return top << 24 | int(p[offset + 2]) << 16 | int(p[offset + 1]) << 8 | int(p[offset])
+
+
+@micropython.viper
+def encode_i16(buffer, offset: int, value: int):
+    p = ptr8(buffer)  # noqa: F821
+    p[offset] = value
+    p[offset + 1] = value >> 8
+
+
+@micropython.viper
+def encode_i32(buffer, offset: int, value: int):
+    p = ptr8(buffer)  # noqa: F821
+    p[offset] = value
+    p[offset + 1] = value >> 8
+    p[offset + 2] = value >> 16
+    p[offset + 3] = value >> 24
+
+
+@micropython.native
+def wait_command_emptied(i2c, i2c_address, buffer):
+    i2c.readfrom_mem_into(i2c_address, _MEM_ADDR_COMMAND_EXECUTE, buffer)
+    while buffer[0] != 0:
+        i2c.readfrom_mem_into(i2c_address, _MEM_ADDR_COMMAND_EXECUTE, buffer)
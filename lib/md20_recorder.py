@@ -0,0 +1,78 @@
+import struct
+import md20
+from md20 import (
+    STATE_BLOCK_PWM_DUTY,
+    STATE_BLOCK_SPEED,
+    STATE_BLOCK_STRIDE,
+    const,
+    ticks_diff,
+    ticks_us,
+)
+from md20_telemetry import _run_periodic
+
+MAGIC = b"MD2R"
+FORMAT_VERSION: int = const(1)
+
+HEADER_FORMAT = "<4sBBHIB"
+RECORD_TIME_FORMAT = "<I"
+MOTOR_RECORD_FORMAT = "<Biiih"
+
+# state byte, then speed, position, pulse count and pwm duty exactly as laid out in the state block
+_LIVE_OFFSET: int = const(STATE_BLOCK_SPEED)
+_LIVE_SIZE: int = const(STATE_BLOCK_PWM_DUTY + 2 - STATE_BLOCK_SPEED)
+_MOTOR_RECORD_SIZE: int = const(1 + _LIVE_SIZE)
+RECORD_SIZE: int = const(4 + _MOTOR_RECORD_SIZE * md20.MOTOR_NUM)
+
+
+class TelemetryRecorder:
+
+    def __init__(self, md20_obj, file, period_ms=10, chunk_records=64):
+        self._md20 = md20_obj
+        self._file = file
+        self.period_ms = period_ms
+        self._buffer = bytearray(RECORD_SIZE * chunk_records)
+        self._fill = 0
+        self._elapsed_us = 0
+        self._last_us = 0
+        self.records = 0
+        self.overruns = 0
+        layout = MOTOR_RECORD_FORMAT.encode()
+        file.write(struct.pack(HEADER_FORMAT, MAGIC, FORMAT_VERSION, md20.MOTOR_NUM, RECORD_SIZE, period_ms * 1000, len(layout)))
+        file.write(layout)
+
+    def record(self):
+        now = ticks_us()
+        if self.records:
+            self._elapsed_us += ticks_diff(now, self._last_us)
+        self._last_us = now
+        state_buffer = self._md20._read_state_block()
+        buffer = self._buffer
+        fill = self._fill
+        struct.pack_into(RECORD_TIME_FORMAT, buffer, fill, self._elapsed_us & 0xFFFFFFFF)
+        fill += 4
+        for index in range(md20.MOTOR_NUM):
+            mem_offset = index * STATE_BLOCK_STRIDE
+            buffer[fill] = state_buffer[mem_offset]
+            source = mem_offset + _LIVE_OFFSET
+            for i in range(_LIVE_SIZE):
+                buffer[fill + 1 + i] = state_buffer[source + i]
+            fill += _MOTOR_RECORD_SIZE
+        self.records += 1
+        if fill == len(buffer):
+            self._file.write(buffer)
+            fill = 0
+        self._fill = fill
+
+    def flush(self):
+        if self._fill:
+            self._file.write(memoryview(self._buffer)[: self._fill])
+            self._fill = 0
+        self._file.flush()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+    async def run(self, duration_ms=None):
+        await _run_periodic(self, self.record, duration_ms)
+        self.flush()
@@ -0,0 +1,141 @@
+import asyncio
+from array import array
+import md20
+from md20 import (
+    STATE_BLOCK_POSITION,
+    STATE_BLOCK_PULSE_COUNT,
+    STATE_BLOCK_PWM_DUTY,
+    STATE_BLOCK_SPEED,
+    STATE_BLOCK_STRIDE,
+    _decode_i16,
+    _decode_i32,
+    const,
+    ticks_diff,
+    ticks_ms,
+    ticks_us,
+)
+
+FIELD_STATE: int = const(0)
+FIELD_SPEED: int = const(1)
+FIELD_POSITION: int = const(2)
+FIELD_PULSE_COUNT: int = const(3)
+FIELD_PWM_DUTY: int = const(4)
+
+FIELD_NUM: int = const(5)
+
+
+async def _run_periodic(owner, step, duration_ms=None):
+    start = ticks_ms()
+    deadline = start
+    while duration_ms is None or ticks_diff(ticks_ms(), start) < duration_ms:
+        step()
+        deadline += owner.period_ms
+        delay = ticks_diff(deadline, ticks_ms())
+        if delay < 0:
+            missed = -delay // owner.period_ms + 1
+            owner.overruns += missed
+            deadline += missed * owner.period_ms
+            delay += missed * owner.period_ms
+        await asyncio.sleep(delay / 1000)
+
+
+class TelemetrySampler:
+
+    def __init__(self, md20_obj, period_ms=10, depth=64):
+        self._md20 = md20_obj
+        self.period_ms = period_ms
+        self.depth = depth
+        self._buffers = [[array("i", bytes(4 * depth)) for _ in range(FIELD_NUM)] for _ in range(md20.MOTOR_NUM)]
+        self._head = 0
+        self.count = 0
+        self.samples = 0
+        self.overruns = 0
+        self._elapsed_us = 0
+        self._last_us = 0
+        self._timer = None
+        self._task = None
+        self._pending = False
+        self._schedule = None
+        self._scheduled_ref = self._scheduled
+        self._timer_callback_ref = self._timer_callback
+
+    def sample(self):
+        now = ticks_us()
+        if self.samples:
+            self._elapsed_us += ticks_diff(now, self._last_us)
+        self._last_us = now
+        state_buffer = self._md20._read_state_block()
+        head = self._head
+        for index in range(md20.MOTOR_NUM):
+            mem_offset = index * STATE_BLOCK_STRIDE
+            buffers = self._buffers[index]
+            buffers[FIELD_STATE][head] = state_buffer[mem_offset]
+            buffers[FIELD_SPEED][head] = _decode_i32(state_buffer, mem_offset + STATE_BLOCK_SPEED)
+            buffers[FIELD_POSITION][head] = _decode_i32(state_buffer, mem_offset + STATE_BLOCK_POSITION)
+            buffers[FIELD_PULSE_COUNT][head] = _decode_i32(state_buffer, mem_offset + STATE_BLOCK_PULSE_COUNT)
+            buffers[FIELD_PWM_DUTY][head] = _decode_i16(state_buffer, mem_offset + STATE_BLOCK_PWM_DUTY)
+        self._head = (head + 1) % self.depth
+        if self.count < self.depth:
+            self.count += 1
+        self.samples += 1
+
+    def latest(self, motor_index, field):
+        if self.count == 0:
+            return None
+        return self._buffers[motor_index][field][(self._head - 1) % self.depth]
+
+    def history(self, motor_index, field, out):
+        size = min(len(out), self.count)
+        buffer = self._buffers[motor_index][field]
+        start = self._head - size
+        for i in range(size):
+            out[i] = buffer[(start + i) % self.depth]
+        return size
+
+    @property
+    def sample_rate(self):
+        if self.samples < 2:
+            return 0.0
+        return (self.samples - 1) * 1000000 / self._elapsed_us
+
+    @property
+    def target_rate(self):
+        return 1000 / self.period_ms
+
+    def reset_stats(self):
+        self.samples = 0
+        self.overruns = 0
+        self._elapsed_us = 0
+
+    async def run(self):
+        await _run_periodic(self, self.sample)
+
+    def start(self, timer_id=-1):
+        if self._timer is not None:
+            return
+        import machine
+        import micropython
+
+        self._schedule = micropython.schedule
+        self._timer = machine.Timer(timer_id)
+        self._timer.init(period=self.period_ms, mode=machine.Timer.PERIODIC, callback=self._timer_callback_ref)
+
+    def stop(self):
+        if self._timer is not None:
+            self._timer.deinit()
+            self._timer = None
+
+    def _timer_callback(self, timer):
+        if self._pending:
+            self.overruns += 1
+            return
+        self._pending = True
+        try:
+            self._schedule(self._scheduled_ref, None)
+        except RuntimeError:
+            self._pending = False
+            self.overruns += 1
+
+    def _scheduled(self, _):
+        self._pending = False
+        self.sample()
@@ -0,0 +1,103 @@
+import struct
+from md20 import const, ticks_diff, ticks_us
+
+MAGIC = b"MD2T"
+FORMAT_VERSION: int = const(1)
+
+HEADER_FORMAT = "<4sBHH"
+RECORD_FORMAT = "<IHBBBxH"
+RECORD_HEADER_SIZE: int = const(12)
+
+OP_WRITE: int = const(0)
+OP_READ: int = const(1)
+
+
+class TraceI2C:
+
+    def __init__(self, i2c, depth=256, payload_size=24, file=None):
+        self._i2c = i2c
+        self.depth = depth
+        self.payload_size = payload_size
+        self.record_size = RECORD_HEADER_SIZE + payload_size
+        self._ring = bytearray(self.record_size * depth)
+        self._head = 0
+        self._pending = 0
+        self._last_us = ticks_us()
+        self._elapsed_us = 0
+        self._file = file
+        self.records = 0
+        self.overwritten = 0
+        if file is not None:
+            self._write_header(file)
+        if hasattr(i2c, "latch_readfrom_mem_into"):
+            self.latch_readfrom_mem_into = self._latch_readfrom_mem_into
+
+    def _write_header(self, file):
+        file.write(struct.pack(HEADER_FORMAT, MAGIC, FORMAT_VERSION, self.record_size, self.payload_size))
+
+    def _record(self, start, op, i2c_address, mem_addr, buffer, size):
+        end = ticks_us()
+        ring = self._ring
+        offset = self._head * self.record_size
+        self._elapsed_us += ticks_diff(start, self._last_us)
+        self._last_us = start
+        struct.pack_into(RECORD_FORMAT, ring, offset, self._elapsed_us & 0xFFFFFFFF, min(ticks_diff(end, start), 0xFFFF), op, i2c_address, mem_addr, size)
+        offset += RECORD_HEADER_SIZE
+        for i in range(min(size, self.payload_size)):
+            ring[offset + i] = buffer[i]
+        self._head = (self._head + 1) % self.depth
+        self.records += 1
+        if self._pending == self.depth:
+            self.overwritten += 1
+        else:
+            self._pending += 1
+
+    def writeto_mem(self, i2c_address, mem_addr, buffer):
+        start = ticks_us()
+        self._i2c.writeto_mem(i2c_address, mem_addr, buffer)
+        self._record(start, OP_WRITE, i2c_address, mem_addr, buffer, len(buffer))
+
+    def readfrom_mem(self, i2c_address, mem_addr, size):
+        start = ticks_us()
+        data = self._i2c.readfrom_mem(i2c_address, mem_addr, size)
+        self._record(start, OP_READ, i2c_address, mem_addr, data, size)
+        return data
+
+    def readfrom_mem_into(self, i2c_address, mem_addr, buffer):
+        start = ticks_us()
+        self._i2c.readfrom_mem_into(i2c_address, mem_addr, buffer)
+        self._record(start, OP_READ, i2c_address, mem_addr, buffer, len(buffer))
+
+    def _latch_readfrom_mem_into(self, i2c_address, latch_addr, mem_addr, buffer):
+        start = ticks_us()
+        self._i2c.latch_readfrom_mem_into(i2c_address, latch_addr, mem_addr, buffer)
+        self._record(start, OP_WRITE, i2c_address, latch_addr, b"\x00", 1)
+        self._record(start, OP_READ, i2c_address, mem_addr, buffer, len(buffer))
+
+    def _write_records(self, file, count):
+        ring = memoryview(self._ring)
+        record_size = self.record_size
+        first = (self._head - count) % self.depth
+        if first + count <= self.depth:
+            file.write(ring[first * record_size : (first + count) * record_size])
+        else:
+            file.write(ring[first * record_size :])
+            file.write(ring[: self._head * record_size])
+
+    def flush(self):
+        if self._file is None:
+            return
+        if self._pending:
+            self._write_records(self._file, self._pending)
+            self._pending = 0
+        self._file.flush()
+
+    def save(self, file):
+        self._write_header(file)
+        self._write_records(file, min(self.records, self.depth))
+
+    def close(self):
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
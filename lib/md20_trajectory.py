@@ -0,0 +1,99 @@
+import md20
+from md20 import (
+    DEGREES_PER_SECOND_PER_RPM,
+    STATE_BLOCK_POSITION,
+    STATE_BLOCK_STRIDE,
+    _decode_i32,
+    sleep_ms,
+    ticks_diff,
+    ticks_ms,
+    ticks_us,
+)
+
+
+class TrajectoryStreamer:
+
+    def __init__(self, md20_obj, lookahead=10, poll_ms=5, segment_timeout_ms=10000):
+        self._md20 = md20_obj
+        self.lookahead = lookahead
+        self.poll_ms = poll_ms
+        self.segment_timeout_ms = segment_timeout_ms
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.segments = 0
+        self.polls = 0
+        self.min_segment_us = None
+        self.max_segment_us = 0
+        self.total_segment_us = 0
+        self.lead_us = 0
+        self.idle_us = 0
+
+    @property
+    def avg_segment_us(self):
+        return self.total_segment_us // self.segments if self.segments else 0
+
+    def _issue(self, waypoint):
+        targets, speed = waypoint
+        with self._md20.batch():
+            for index, target in enumerate(targets):
+                if target is not None:
+                    self._md20[index].move_to(target, speed)
+        return ticks_us()
+
+    def _approach(self, waypoint, lookahead):
+        targets, speed = waypoint
+        start = ticks_ms()
+        while True:
+            state_buffer = self._md20._read_state_block()
+            self.polls += 1
+            remaining = 0
+            for index, target in enumerate(targets):
+                if target is None:
+                    continue
+                offset = index * STATE_BLOCK_STRIDE
+                state = state_buffer[offset]
+                if state == md20.STATE_REACHED_POSITION:
+                    continue
+                if state != md20.STATE_RUNNING_TO_POSITION:
+                    return md20.WAIT_INTERRUPTED, 0
+                position = _decode_i32(state_buffer, offset + STATE_BLOCK_POSITION)
+                remaining = max(remaining, abs(target - position))
+            if remaining <= lookahead:
+                return md20.WAIT_REACHED, remaining
+            if ticks_diff(ticks_ms(), start) >= self.segment_timeout_ms:
+                return md20.WAIT_TIMEOUT, remaining
+            sleep_ms(self.poll_ms)
+
+    def _record(self, issued_us, waypoint, remaining):
+        segment_us = ticks_diff(ticks_us(), issued_us)
+        self.segments += 1
+        self.total_segment_us += segment_us
+        self.max_segment_us = max(self.max_segment_us, segment_us)
+        self.min_segment_us = segment_us if self.min_segment_us is None else min(self.min_segment_us, segment_us)
+        speed = abs(waypoint[1])
+        if remaining and speed:
+            self.lead_us += remaining * 1000000 // (speed * DEGREES_PER_SECOND_PER_RPM)
+
+    def run(self, waypoints):
+        waypoints = iter(waypoints)
+        waypoint = next(waypoints, None)
+        if waypoint is None:
+            return md20.WAIT_REACHED
+        issued_us = self._issue(waypoint)
+        while True:
+            upcoming = next(waypoints, None)
+            if upcoming is None:
+                result, _ = self._approach(waypoint, 0)
+                self._record(issued_us, waypoint, 0)
+                return result
+            result, remaining = self._approach(waypoint, self.lookahead)
+            if result != md20.WAIT_REACHED:
+                return result
+            handoff_us = ticks_us()
+            next_issued_us = self._issue(upcoming)
+            if remaining == 0:
+                self.idle_us += ticks_diff(next_issued_us, handoff_us)
+            self._record(issued_us, waypoint, remaining)
+            waypoint = upcoming
+            issued_us = next_issued_us
@@ -0,0 +1,149 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib"))
+
+import md20  # noqa: E402
+import md20_bus  # noqa: E402
+from md20_emulator import EmulatedBus, Md20Emulator  # noqa: E402
+
+BUS_ADDRESSES = (0x16, 0x17, 0x18)
+
+
+def bench_init(emulator):
+    md20.Md20(emulator)
+
+
+def bench_init_without_reset(emulator):
+    md20.Md20(emulator, reset=False)
+
+
+def bench_init_lazy(emulator):
+    md20.Md20(emulator, lazy=True)[0]
+
+
+def bench_run_speed(emulator, md20_obj):
+    md20_obj[0].run_speed(100)
+
+
+def bench_move_to(emulator, md20_obj):
+    md20_obj[0].move_to(720, 60)
+
+
+def bench_run_speed_all(emulator, md20_obj):
+    md20_obj.run_speed_all((100, 100, 100, 100))
+
+
+def bench_pid_setup(emulator, md20_obj):
+    for i in range(md20.MOTOR_NUM):
+        md20_obj[i].setup_encoder_mode(12, 90, md20.PHASE_RELATION_A_PHASE_LEADS)
+        md20_obj[i].speed_pid_p = 1.5
+        md20_obj[i].speed_pid_i = 1.5
+        md20_obj[i].speed_pid_d = 1.0
+        md20_obj[i].position_pid_p = 10.0
+        md20_obj[i].position_pid_i = 1.0
+        md20_obj[i].position_pid_d = 1.0
+
+
+def bench_telemetry_properties(emulator, md20_obj):
+    for i in range(md20.MOTOR_NUM):
+        md20_obj[i].speed
+        md20_obj[i].pwm_duty
+        md20_obj[i].position
+        md20_obj[i].pulse_count
+        md20_obj[i].state
+
+
+def bench_snapshot_all(emulator, md20_obj):
+    md20_obj.snapshot_all()
+
+
+def bench_shadow_properties(emulator, md20_obj):
+    md20_obj.shadow.invalidate()
+    bench_telemetry_properties(emulator, md20_obj)
+    md20_obj.snapshot_all()
+
+
+BENCHMARKS = (
+    ("Md20.__init__", bench_init),
+    ("Md20.__init__ no reset", bench_init_without_reset),
+    ("Md20.__init__ lazy [0]", bench_init_lazy),
+    ("Motor.run_speed", bench_run_speed),
+    ("Motor.move_to", bench_move_to),
+    ("Md20.run_speed_all", bench_run_speed_all),
+    ("encoder + PID setup", bench_pid_setup),
+    ("telemetry properties", bench_telemetry_properties),
+    ("Md20.snapshot_all", bench_snapshot_all),
+    ("shadow properties tick", bench_shadow_properties),
+)
+
+
+def bench_boards_run_speed_all(boards):
+    for board in boards:
+        board.run_speed_all((100, 100, 100, 100))
+
+
+def bench_bus_run_speed_all(bus):
+    bus.run_speed_all((100,) * (md20.MOTOR_NUM * len(bus)))
+
+
+MULTI_BOARD_BENCHMARKS = (
+    ("3 boards run_speed_all", bench_boards_run_speed_all),
+    ("Md20Bus.run_speed_all", bench_bus_run_speed_all),
+)
+
+
+def run_multi_board(benchmark, repeat, **emulator_options):
+    i2c = EmulatedBus([Md20Emulator(i2c_address, **emulator_options) for i2c_address in BUS_ADDRESSES])
+    if benchmark is bench_bus_run_speed_all:
+        target = md20_bus.Md20Bus(i2c, BUS_ADDRESSES)
+    else:
+        target = [md20.Md20(i2c, i2c_address) for i2c_address in BUS_ADDRESSES]
+    i2c.reset_counters()
+    for _ in range(repeat):
+        benchmark(target)
+    return (
+        i2c.transactions / repeat,
+        i2c.bytes_transferred / repeat,
+        i2c.bus_time_us / repeat,
+    )
+
+
+def run(benchmark, repeat, **emulator_options):
+    emulator = Md20Emulator(**emulator_options)
+    if benchmark in (bench_init, bench_init_without_reset, bench_init_lazy):
+        args = (emulator,)
+    elif benchmark is bench_shadow_properties:
+        args = (emulator, md20.Md20(emulator, max_age_ms=1000))
+    else:
+        args = (emulator, md20.Md20(emulator))
+    emulator.reset_counters()
+    for _ in range(repeat):
+        benchmark(*args)
+    return (
+        emulator.transactions / repeat,
+        emulator.bytes_transferred / repeat,
+        emulator.bus_time_us / repeat,
+    )
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Count I2C traffic per md20 API call against the register-level emulator.")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--freq", type=int, default=400000)
+    parser.add_argument("--command-latency-us", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    print(f"{'benchmark':<24}{'transactions':>14}{'bytes':>10}{'bus time us':>14}")
+    for name, benchmark in BENCHMARKS:
+        transactions, size, bus_time_us = run(benchmark, args.repeat, freq=args.freq, command_latency_us=args.command_latency_us)
+        print(f"{name:<24}{transactions:>14.1f}{size:>10.1f}{bus_time_us:>14.1f}")
+    for name, benchmark in MULTI_BOARD_BENCHMARKS:
+        transactions, size, bus_time_us = run_multi_board(benchmark, args.repeat, freq=args.freq, command_latency_us=args.command_latency_us)
+        print(f"{name:<24}{transactions:>14.1f}{size:>10.1f}{bus_time_us:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import struct
+import sys
+
+MAGIC = b"MD2R"
+HEADER_FORMAT = "<4sBBHIB"
+FIELDS = ("state", "speed", "position", "pulse_count", "pwm_duty")
+
+
+def decode(file):
+    magic, version, motor_num, record_size, period_us, layout_size = struct.unpack(HEADER_FORMAT, file.read(struct.calcsize(HEADER_FORMAT)))
+    if magic != MAGIC:
+        raise ValueError("not an md20 telemetry recording")
+    if version != 1:
+        raise ValueError(f"unsupported recording version {version}")
+    motor_format = file.read(layout_size).decode()
+    record_format = "<I" + motor_format.lstrip("<") * motor_num
+    if struct.calcsize(record_format) != record_size:
+        raise ValueError("record layout does not match record size")
+
+    columns = {"time_us": []}
+    for index in range(motor_num):
+        for field in FIELDS:
+            columns[f"motor{index}.{field}"] = []
+    names = list(columns)
+
+    data = file.read()
+    usable = len(data) - len(data) % record_size
+    elapsed_high = 0
+    last_time = 0
+    for values in struct.iter_unpack(record_format, data[:usable]):
+        time_us = values[0]
+        if time_us < last_time:
+            elapsed_high += 1 << 32
+        last_time = time_us
+        columns["time_us"].append(elapsed_high + time_us)
+        for name, value in zip(names[1:], values[1:]):
+            columns[name].append(value)
+    return {"period_us": period_us, "motor_num": motor_num, "columns": columns}
+
+
+def main(argv=None):
+    import argparse
+    import csv
+
+    parser = argparse.ArgumentParser(description="Decode an md20 telemetry recording into CSV columns.")
+    parser.add_argument("recording")
+    parser.add_argument("-o", "--output", help="CSV file to write, defaults to stdout")
+    args = parser.parse_args(argv)
+
+    with open(args.recording, "rb") as file:
+        recording = decode(file)
+    columns = recording["columns"]
+    output = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        writer = csv.writer(output)
+        writer.writerow(columns)
+        writer.writerows(zip(*columns.values()))
+    finally:
+        if args.output:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# Run from the repository root, under MicroPython (unix port or on a board) or CPython:
+#   micropython tools/microbenchmark.py
+import sys
+
+sys.path.insert(0, "lib")
+
+import md20  # noqa: E402
+from md20 import ticks_diff, ticks_us  # noqa: E402
+
+ITERATIONS = 2000
+
+
+class EmptySlotI2C:
+
+    def writeto_mem(self, address, mem_addr, buffer):
+        pass
+
+    def readfrom_mem_into(self, address, mem_addr, buffer):
+        buffer[0] = 0
+
+
+def measure(function, *args):
+    start = ticks_us()
+    for _ in range(ITERATIONS):
+        function(*args)
+    return ticks_diff(ticks_us(), start) * 1000 // ITERATIONS
+
+
+def compare(name, python_variant, fast_variant, *args):
+    python_ns = measure(python_variant, *args)
+    if fast_variant is python_variant:
+        print(f"{name:<24}{python_ns:>12}{'n/a':>12}")
+        return
+    fast_ns = measure(fast_variant, *args)
+    print(f"{name:<24}{python_ns:>12}{fast_ns:>12}")
+
+
+def main():
+    buffer = bytearray(b"\x9c\xff\xff\xff")
+
+    print(f"{'operation (ns per call)':<24}{'python':>12}{'fast':>12}")
+    compare("decode u16", md20._decode_u16_python, md20._decode_u16, buffer, 0)
+    compare("decode i16", md20._decode_i16_python, md20._decode_i16, buffer, 0)
+    compare("decode i32", md20._decode_i32_python, md20._decode_i32, buffer, 0)
+    compare("encode i16", md20._encode_i16_python, md20._encode_i16, buffer, 0, -100)
+    compare("encode i32", md20._encode_i32_python, md20._encode_i32, buffer, 0, -100)
+    compare(
+        "wait command emptied",
+        md20._wait_command_emptied_python,
+        md20._wait_command_emptied,
+        EmptySlotI2C(),
+        md20.DEFAULT_I2C_ADDRESS,
+        bytearray(1),
+    )
+
+
+main()
@@ -0,0 +1,138 @@
+import os
+import struct
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib"))
+
+import md20  # noqa: E402
+from md20_emulator import EmulatedBus, Md20Emulator  # noqa: E402
+from md20_trace import FORMAT_VERSION, HEADER_FORMAT, MAGIC, OP_READ, OP_WRITE, RECORD_FORMAT, RECORD_HEADER_SIZE  # noqa: E402
+
+
+def decode(file):
+    magic, version, record_size, payload_size = struct.unpack(HEADER_FORMAT, file.read(struct.calcsize(HEADER_FORMAT)))
+    if magic != MAGIC:
+        raise ValueError("not an md20 i2c trace")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"unsupported trace version {version}")
+    if record_size != RECORD_HEADER_SIZE + payload_size:
+        raise ValueError("record size does not match payload size")
+
+    records = []
+    data = file.read()
+    usable = len(data) - len(data) % record_size
+    elapsed_high = 0
+    last_time = 0
+    for offset in range(0, usable, record_size):
+        time_us, duration_us, op, i2c_address, mem_addr, size = struct.unpack_from(RECORD_FORMAT, data, offset)
+        if time_us < last_time:
+            elapsed_high += 1 << 32
+        last_time = time_us
+        start = offset + RECORD_HEADER_SIZE
+        payload = data[start : start + min(size, payload_size)]
+        records.append((elapsed_high + time_us, duration_us, op, i2c_address, mem_addr, size, payload))
+    return records
+
+
+def _is_poll(record):
+    return record[2] == OP_READ and record[4] == md20._MEM_ADDR_COMMAND_EXECUTE and record[5] == 1
+
+
+def summarize(records):
+    summary = {
+        "transactions": len(records),
+        "duration_us": 0,
+        "transactions_per_second": 0,
+        "bytes": 0,
+        "writes": 0,
+        "reads": 0,
+        "commands": 0,
+        "latch_read_pairs": 0,
+        "redundant_reads": 0,
+        "command_polls": 0,
+        "command_poll_time_us": 0,
+    }
+    if not records:
+        return summary
+    first = records[0]
+    last = records[-1]
+    duration_us = last[0] + last[1] - first[0]
+    summary["duration_us"] = duration_us
+    if duration_us:
+        summary["transactions_per_second"] = len(records) * 1000000 // duration_us
+
+    last_reads = {}
+    poll_start = None
+    for index, record in enumerate(records):
+        time_us, duration_us, op, i2c_address, mem_addr, size, payload = record
+        summary["bytes"] += size
+        if op == OP_WRITE:
+            summary["writes"] += 1
+            if mem_addr == md20._MEM_ADDR_COMMAND_TYPE:
+                summary["commands"] += 1
+            if mem_addr >= md20._MEM_ADDR_STATE and size == 1 and index + 1 < len(records):
+                following = records[index + 1]
+                if following[2] == OP_READ and following[3] == i2c_address:
+                    summary["latch_read_pairs"] += 1
+        else:
+            summary["reads"] += 1
+        if _is_poll(record):
+            summary["command_polls"] += 1
+            if poll_start is None:
+                poll_start = time_us
+            if index + 1 == len(records) or not _is_poll(records[index + 1]):
+                summary["command_poll_time_us"] += time_us + duration_us - poll_start
+                poll_start = None
+        elif op == OP_READ:
+            key = (i2c_address, mem_addr, size)
+            if last_reads.get(key) == payload:
+                summary["redundant_reads"] += 1
+            last_reads[key] = payload
+    return summary
+
+
+def replay(records, **emulator_options):
+    addresses = sorted({record[3] for record in records})
+    devices = [Md20Emulator(i2c_address, **emulator_options) for i2c_address in addresses]
+    bus = EmulatedBus(devices)
+    origin = records[0][0] if records else 0
+    divergent_reads = 0
+    for time_us, duration_us, op, i2c_address, mem_addr, size, payload in records:
+        for device in devices:
+            lag = time_us - origin - device.now_us
+            if lag > 0:
+                device.advance(lag)
+        if op == OP_WRITE:
+            bus.writeto_mem(i2c_address, mem_addr, payload + bytes(size - len(payload)))
+        else:
+            buffer = bytearray(size)
+            bus.readfrom_mem_into(i2c_address, mem_addr, buffer)
+            if buffer[: len(payload)] != payload:
+                divergent_reads += 1
+    return {
+        "replayed": len(records),
+        "divergent_reads": divergent_reads,
+        "emulated_bus_time_us": bus.bus_time_us,
+        "emulated_commands": sum(device.commands for device in devices),
+    }
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Summarize an md20 i2c trace and replay it against the register-level emulator.")
+    parser.add_argument("trace")
+    parser.add_argument("--freq", type=int, default=400000)
+    parser.add_argument("--command-latency-us", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    with open(args.trace, "rb") as file:
+        records = decode(file)
+    results = summarize(records)
+    results.update(replay(records, freq=args.freq, command_latency_us=args.command_latency_us))
+    for name, value in results.items():
+        print(f"{name:<28}{value:>14}")
+
+
+if __name__ == "__main__":
+    main()